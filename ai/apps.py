@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+import logging
+
 from django.apps import AppConfig
 
+logger = logging.getLogger(__name__)
+
 
 class AiConfig(AppConfig):
     """App config for AI-powered endpoints and services."""
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "ai"
+
+    def ready(self):
+        from notifications.services import gemini_clients
+
+        try:
+            gemini_clients.warm()
+        except Exception:  # pragma: no cover - never block startup on Gemini
+            logger.exception("Gemini client warm-up failed")
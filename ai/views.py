@@ -10,8 +10,7 @@ from rest_framework.views import APIView
 from social.models import Favorite, Like, Review
 from notifications.services import gemini_generate_recommendations
 from notifications.services import gemini_healthcheck
-from movies.models import Movie
-from movies.services import get_movie_details, map_omdb_to_fields
+from movies.services import hydrate_movies
 
 
 logger = logging.getLogger(__name__)
@@ -86,39 +85,20 @@ class RecommendationsView(APIView):
         # downstream errors when movie records are missing in DB.
         try:
             if isinstance(recos, list):
-                for item in recos:
-                    try:
-                        imdb_id = (item.get("imdb_id") or "").strip()
-                        if not imdb_id:
-                            continue
-                        exists = Movie.objects.filter(imdb_id=imdb_id).exists()
-                        if not exists:
-                            payload = get_movie_details(imdb_id)
-                            if payload and payload.get("Response") != "False":
-                                fields = map_omdb_to_fields(payload)
-                                Movie.objects.create(**fields)
-                                logger.debug(
-                                    "reco_upsert: created id=%s "
-                                    "title=%s",
-                                    imdb_id,
-                                    fields.get("title"),
-                                )
-                            else:
-                                logger.debug(
-                                    "reco_upsert: OMDb fail id=%s",
-                                    imdb_id,
-                                )
-                    except Exception:
-                        imdb_val = None
-                        if isinstance(item, dict):
-                            imdb_val = item.get("imdb_id")
-                        logger.exception(
-                            "reco_upsert: failed imdb_id=%s",
-                            imdb_val,
-                        )
+                imdb_ids = [
+                    (item.get("imdb_id") or "").strip()
+                    for item in recos
+                    if isinstance(item, dict)
+                ]
+                movies = hydrate_movies(i for i in imdb_ids if i)
+                logger.debug(
+                    "reco_upsert: requested=%s available=%s",
+                    len([i for i in imdb_ids if i]),
+                    len(movies),
+                )
         except Exception:
             # Never fail the endpoint due to upsert attempts
-            logger.exception("reco_upsert: outer failure")
+            logger.exception("reco_upsert: failure")
         return Response(recos)
 
 
@@ -26,6 +26,10 @@ class AnalyticsEvent(models.Model):
             models.Index(fields=["event"]),
             models.Index(fields=["imdb_id"]),
             models.Index(fields=["created_at"]),
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="analytics_user_feed_idx",
+            ),
         ]
         ordering = ["-created_at"]
 
@@ -7,6 +7,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from movie_social_backend.pagination import KeysetPagination
+
 from .models import AnalyticsEvent
 from .serializers import AnalyticsEventSerializer
 from .authentication import N8NSharedSecretAuthentication
@@ -76,6 +78,7 @@ class AnalyticsListView(generics.ListAPIView):
 
     serializer_class = AnalyticsEventSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         qs = AnalyticsEvent.objects.filter(user=self.request.user)
@@ -49,6 +49,14 @@ class ModerationQueue(models.Model):
             models.Index(fields=["status"]),
             models.Index(fields=["content_type", "content_id"]),
             models.Index(fields=["created_at"]),
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="moderation_feed_idx",
+            ),
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="moderation_status_feed_idx",
+            ),
         ]
         ordering = ["-created_at"]
 
@@ -7,6 +7,8 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from movie_social_backend.pagination import KeysetPagination
+
 from .models import ModerationQueue
 from .serializers import ModerationQueueSerializer
 
@@ -63,6 +65,7 @@ class ModerationQueueListView(generics.ListAPIView):
     """
     serializer_class = ModerationQueueSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         qs = ModerationQueue.objects.all()
@@ -11,7 +11,14 @@ class MovieNight {
   final String? location;
   final String status;
   final int? maxParticipants;
+  /// Full participant list; only sent by the detail endpoint.
   final List<MovieNightParticipant> participants;
+  /// Per-status participant counts; only sent by the list endpoint.
+  final Map<String, int>? participantCounts;
+  /// First few accepted participants; only sent by the list endpoint.
+  final List<AppUser> participantPreview;
+  /// Current user's participation status; only sent by the list endpoint.
+  final String? myStatus;
   final List<MovieNightVote> votes;
   final DateTime? createdAt;
   final DateTime? updatedAt;
@@ -26,6 +33,9 @@ class MovieNight {
     required this.status,
     this.maxParticipants,
     required this.participants,
+    this.participantCounts,
+    this.participantPreview = const [],
+    this.myStatus,
     required this.votes,
     this.createdAt,
     this.updatedAt,
@@ -44,6 +54,13 @@ class MovieNight {
       participants: ((json['participants'] as List?) ?? const [])
           .map((e) => MovieNightParticipant.fromJson(e as Map<String, dynamic>))
           .toList(),
+      participantCounts: (json['participant_counts'] as Map?)?.map(
+        (k, v) => MapEntry(k.toString(), (v as num).toInt()),
+      ),
+      participantPreview: ((json['participant_preview'] as List?) ?? const [])
+          .map((e) => AppUser.fromJson(e as Map<String, dynamic>))
+          .toList(),
+      myStatus: json['my_status'] as String?,
       votes: ((json['votes'] as List?) ?? const [])
           .map((e) => MovieNightVote.fromJson(e as Map<String, dynamic>))
           .toList(),
@@ -62,10 +79,31 @@ class MovieNight {
         'status': status,
         'max_participants': maxParticipants,
         'participants': participants.map((e) => e.toJson()).toList(),
+        'participant_counts': participantCounts,
+        'participant_preview': participantPreview.map((e) => e.toJson()).toList(),
+        'my_status': myStatus,
         'votes': votes.map((e) => e.toJson()).toList(),
         'created_at': createdAt?.toIso8601String(),
         'updated_at': updatedAt?.toIso8601String(),
       };
+
+  /// Whether this came from the list endpoint (summary fields, no participants).
+  bool get isSummary => participantCounts != null;
+
+  /// Participation status of [userId], from `my_status` on list responses
+  /// or the participant list on detail responses.
+  String? statusFor(int userId) {
+    if (isSummary) return myStatus;
+    for (final p in participants) {
+      if (p.user.id == userId) return p.status;
+    }
+    return null;
+  }
+
+  /// Number of accepted participants.
+  int get goingCount => isSummary
+      ? (participantCounts!['accepted'] ?? 0)
+      : participants.where((p) => p.status == 'accepted').length;
 }
 
 DateTime? _parseDateTime(dynamic v) {
@@ -70,6 +70,15 @@ class MovieNightsProvider extends ChangeNotifier {
     }
   }
 
+  /// Detail (with the full participant list) for [id], or null on failure.
+  Future<MovieNight?> fetchDetail(int id) async {
+    try {
+      return await _social.movieNightDetail(id);
+    } catch (_) {
+      return null;
+    }
+  }
+
   Future<void> join(int id) async {
     error = null;
     joiningIds.add(id);
@@ -85,7 +85,7 @@ class _NightTile extends StatelessWidget {
     if (user == null) return false;
     // Consider "joined" only if organizer or participation is accepted.
     if (user.id == night.organizer.id) return true;
-    return night.participants.any((p) => p.user.id == user.id && p.status == 'accepted');
+    return night.statusFor(user.id) == 'accepted';
   }
 
   @override
@@ -98,15 +98,7 @@ class _NightTile extends StatelessWidget {
     final currentUser = context.read<AuthProvider>().currentUser;
     final isOrganizer = currentUser != null && currentUser.id == night.organizer.id;
     // Determine current user's participation status (if any)
-    String? myStatus;
-    if (currentUser != null) {
-      for (final p in night.participants) {
-        if (p.user.id == currentUser.id) {
-          myStatus = p.status;
-          break;
-        }
-      }
-    }
+    final String? myStatus = currentUser == null ? null : night.statusFor(currentUser.id);
     final bool isInvitePending = myStatus == 'invited' || myStatus == 'maybe';
     return Card(
       child: InkWell(
@@ -170,7 +162,7 @@ class _NightTile extends StatelessWidget {
               children: [
                 const Icon(Icons.group_outlined, size: 16),
                 const SizedBox(width: 6),
-                Text('${night.participants.length} going'),
+                Text('${night.goingCount} going'),
                 const Spacer(),
                 if (!joined)
                   OutlinedButton.icon(
@@ -283,6 +275,8 @@ void _showInviteDialog(BuildContext context, MovieNight night) {
   final searchCtrl = TextEditingController();
   // reset previous search state
   context.read<UserSearchProvider>().clear();
+  // List responses carry no participant list; load it from the detail endpoint
+  final detailFuture = context.read<MovieNightsProvider>().fetchDetail(night.id);
 
   showDialog(
     context: context,
@@ -298,10 +292,15 @@ void _showInviteDialog(BuildContext context, MovieNight night) {
         });
       }
 
-      return StatefulBuilder(
+      return FutureBuilder<MovieNight?>(
+        future: detailFuture,
+        builder: (context, detail) => StatefulBuilder(
         builder: (context, setState) {
           final usersProv = context.watch<UserSearchProvider>();
           final hasQuery = searchCtrl.text.trim().isNotEmpty;
+          final detailLoaded = detail.connectionState == ConnectionState.done;
+          final participantIds =
+              (detail.data?.participants ?? []).map((p) => p.user.id).toSet();
           return AlertDialog(
             title: const Text('Invite friends'),
             content: SizedBox(
@@ -341,7 +340,7 @@ void _showInviteDialog(BuildContext context, MovieNight night) {
                                       separatorBuilder: (_, __) => const Divider(height: 1),
                                       itemBuilder: (context, i) {
                                         final AppUser u = usersProv.results[i];
-                                        final alreadyParticipant = night.participants.any((p) => p.user.id == u.id);
+                                        final alreadyParticipant = participantIds.contains(u.id);
                                         final isSelf = context.read<AuthProvider>().currentUser?.id == u.id;
                                         final isInvited = invitedIds.contains(u.id) || alreadyParticipant;
                                         final isInviting = invitingIds.contains(u.id);
@@ -350,7 +349,7 @@ void _showInviteDialog(BuildContext context, MovieNight night) {
                                           title: Text(u.username),
                                           subtitle: u.email != null ? Text(u.email!) : null,
                                           trailing: OutlinedButton(
-                                            onPressed: (isInvited || isInviting || isSelf)
+                                            onPressed: (!detailLoaded || isInvited || isInviting || isSelf)
                                                 ? null
                                                 : () async {
                                                     setState(() => invitingIds.add(u.id));
@@ -384,6 +383,7 @@ void _showInviteDialog(BuildContext context, MovieNight night) {
             ],
           );
         },
+        ),
       );
     },
   );
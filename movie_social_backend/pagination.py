@@ -0,0 +1,101 @@
+"""
+Shared DRF pagination classes.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Optional
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (seek) pagination on a `(timestamp, id)` pair, newest first.
+
+    Pages are fetched with `WHERE (ts, id) < (cursor_ts, cursor_id)` and
+    `ORDER BY ts DESC, id DESC`, which a composite index on the same
+    columns serves at constant cost for any depth. No COUNT query is run.
+
+    Views choose the timestamp column with `keyset_field` (default
+    `created_at`). The response keeps the `results` key used by clients
+    and exposes `next` as an opaque cursor URL.
+    """
+
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    default_keyset_field = "created_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    def _keyset_field(self, view) -> str:
+        return getattr(view, "keyset_field", self.default_keyset_field)
+
+    def _page_size(self, request) -> int:
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def _decode_cursor(self, request) -> Optional[tuple[Any, int]]:
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None
+        try:
+            padded = raw + "=" * (-len(raw) % 4)
+            ts_raw, pk = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            ts = parse_datetime(ts_raw)
+            if ts is None:
+                raise ValueError(ts_raw)
+            return ts, int(pk)
+        except (TypeError, ValueError, json.JSONDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _encode_cursor(self, ts, pk) -> str:
+        raw = json.dumps([ts.isoformat(), pk]).encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        field = self._keyset_field(view)
+        self.request = request
+        self.field = field
+        size = self._page_size(request)
+        queryset = queryset.order_by(f"-{field}", "-pk")
+        cursor = self._decode_cursor(request)
+        if cursor is not None:
+            ts, pk = cursor
+            queryset = queryset.filter(
+                Q(**{f"{field}__lt": ts}) | Q(**{field: ts, "pk__lt": pk})
+            )
+        rows = list(queryset[: size + 1])
+        self.has_next = len(rows) > size
+        self.page = rows[:size]
+        return self.page
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        cursor = self._encode_cursor(getattr(last, self.field), last.pk)
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -20,6 +20,25 @@ env = environ.Env(
     CORS_ALLOW_ALL_ORIGINS=(bool, False),
     CORS_ALLOWED_ORIGINS=(list, []),
     OMDB_API_KEY=(str, ""),
+    OMDB_POOL_SIZE=(int, 20),
+    OMDB_MAX_RETRIES=(int, 3),
+    OMDB_RETRY_BACKOFF=(float, 0.3),
+    OMDB_CONNECT_TIMEOUT=(float, 3.05),
+    OMDB_READ_TIMEOUT=(float, 10.0),
+    OMDB_SEARCH_CACHE_TTL=(int, 6 * 60 * 60),
+    OMDB_SEARCH_NEGATIVE_TTL=(int, 10 * 60),
+    OMDB_HYDRATE_WORKERS=(int, 8),
+    MOVIE_STALE_AFTER_HOURS=(int, 24 * 7),
+    OMDB_REFRESH_RATE_PER_MINUTE=(int, 30),
+    OMDB_REFRESH_BATCH_SIZE=(int, 20),
+    POPULARITY_HALF_LIFE_HOURS=(float, 72.0),
+    FRIEND_GRAPH_RELOAD_SECONDS=(int, 300),
+    REVIEW_SENTIMENT_WORKERS=(int, 4),
+    REVIEW_SENTIMENT_BATCH_SIZE=(int, 20),
+    SENTIMENT_CACHE_TTL=(int, 30 * 24 * 60 * 60),
+    SENTIMENT_CACHE_MAX_ENTRIES=(int, 50_000),
+    SENTIMENT_LEXICON_THRESHOLD=(float, 0.75),
+    CACHE_URL=(str, ""),
     GEMINI_API_KEY=(str, ""),
     FCM_SERVER_KEY=(str, ""),
     N8N_SHARED_SECRET=(str, ""),
@@ -189,6 +208,8 @@ REST_FRAMEWORK = {
     # Throttle rates used by ScopedRateThrottle in LLM-powered endpoints
     "DEFAULT_THROTTLE_RATES": {
         "llm": "20/minute",
+        # Friend suggestion recomputes scan every Favorite/Like row
+        "friend_suggestions": "30/hour",
     },
 }
 
@@ -219,17 +240,71 @@ CORS_ALLOW_CREDENTIALS = True
 
 # External integrations (read by app services)
 OMDB_API_KEY = env("OMDB_API_KEY")
+# OMDb HTTP client: keep-alive pool size, retry policy (429/5xx) and
+# separate connect/read timeouts in seconds
+OMDB_POOL_SIZE = env("OMDB_POOL_SIZE")
+OMDB_MAX_RETRIES = env("OMDB_MAX_RETRIES")
+OMDB_RETRY_BACKOFF = env("OMDB_RETRY_BACKOFF")
+OMDB_CONNECT_TIMEOUT = env("OMDB_CONNECT_TIMEOUT")
+OMDB_READ_TIMEOUT = env("OMDB_READ_TIMEOUT")
+# OMDb search result cache TTLs in seconds (negative = "Movie not found!")
+OMDB_SEARCH_CACHE_TTL = env("OMDB_SEARCH_CACHE_TTL")
+OMDB_SEARCH_NEGATIVE_TTL = env("OMDB_SEARCH_NEGATIVE_TTL")
+# Max concurrent OMDb fetches when hydrating a batch of imdb_ids
+OMDB_HYDRATE_WORKERS = env("OMDB_HYDRATE_WORKERS")
+# Stale-while-revalidate for cached Movie rows: age before a background
+# refresh is queued, and the refresher's upstream budget and batch size
+MOVIE_STALE_AFTER_HOURS = env("MOVIE_STALE_AFTER_HOURS")
+OMDB_REFRESH_RATE_PER_MINUTE = env("OMDB_REFRESH_RATE_PER_MINUTE")
+OMDB_REFRESH_BATCH_SIZE = env("OMDB_REFRESH_BATCH_SIZE")
+
+# Half-life of engagement events in the trending/popular ranking
+POPULARITY_HALF_LIFE_HOURS = env("POPULARITY_HALF_LIFE_HOURS")
+# How often each process reloads the in-memory friendship graph (loaded on
+# first use) to pick up friendships changed by other workers
+FRIEND_GRAPH_RELOAD_SECONDS = env("FRIEND_GRAPH_RELOAD_SECONDS")
+# Background threads per process running review sentiment after create,
+# and how many reviews are packed into one LLM prompt
+REVIEW_SENTIMENT_WORKERS = env("REVIEW_SENTIMENT_WORKERS")
+REVIEW_SENTIMENT_BATCH_SIZE = env("REVIEW_SENTIMENT_BATCH_SIZE")
+# Local lexicon confidence (0..1) above which review sentiment skips the LLM
+SENTIMENT_LEXICON_THRESHOLD = env("SENTIMENT_LEXICON_THRESHOLD")
 GEMINI_API_KEY = env("GEMINI_API_KEY")
 FCM_SERVER_KEY = env("FCM_SERVER_KEY")
 N8N_SHARED_SECRET = env("N8N_SHARED_SECRET") or None
 if not N8N_SHARED_SECRET:
     warnings.warn("N8N_SHARED_SECRET not configured")
 
-# Caching (used for LLM results and other computed resources)
-CACHES = {
-    "default": {
+# Caching (used for LLM results and other computed resources). The default
+# cache also carries cross-worker state -- vote tally invalidation and the
+# OMDb fetch lock -- so multi-process deployments must point CACHE_URL at a
+# shared backend (e.g. redis://host:6379/1); the in-memory fallback is only
+# coherent within a single process.
+CACHE_URL = env("CACHE_URL")
+if CACHE_URL:
+    DEFAULT_CACHE = env.cache_url("CACHE_URL")
+else:
+    DEFAULT_CACHE = {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         "LOCATION": "movie-social-cache",
-        "TIMEOUT": 60 * 60,  # default 1 hour if not overridden
     }
+    if not DEBUG:
+        warnings.warn("CACHE_URL not configured; using a per-process cache")
+DEFAULT_CACHE.setdefault("TIMEOUT", 60 * 60)  # default 1 hour if not overridden
+# Sentiment results keyed by normalized content hash. With CACHE_URL they share
+# the configured backend under their own key prefix so every worker reuses the
+# same answers; the in-memory fallback is LRU-culled at MAX_ENTRIES.
+if CACHE_URL:
+    SENTIMENT_CACHE = env.cache_url("CACHE_URL")
+    SENTIMENT_CACHE["KEY_PREFIX"] = "sentiment"
+else:
+    SENTIMENT_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "movie-social-sentiment",
+        "OPTIONS": {"MAX_ENTRIES": env("SENTIMENT_CACHE_MAX_ENTRIES")},
+    }
+SENTIMENT_CACHE["TIMEOUT"] = env("SENTIMENT_CACHE_TTL")
+CACHES = {
+    "default": DEFAULT_CACHE,
+    "sentiment": SENTIMENT_CACHE,
 }
@@ -1,8 +1,14 @@
 from django.contrib import admin
-from .models import Movie
+from .models import Genre, Movie
 
 
 @admin.register(Movie)
 class MovieAdmin(admin.ModelAdmin):
     list_display = ("id", "imdb_id", "title", "year")
     search_fields = ("imdb_id", "title", "year")
+
+
+@admin.register(Genre)
+class GenreAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "slug")
+    search_fields = ("name", "slug")
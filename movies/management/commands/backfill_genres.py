@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from movies.models import Movie
+from movies.services import sync_movie_genres
+
+
+class Command(BaseCommand):
+    """Populate the Movie-Genre links from each movie's `genre` string."""
+
+    help = "Backfill normalized Genre rows and Movie-Genre links."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        last_pk = 0
+        total = 0
+        while True:
+            batch = list(
+                Movie.objects.filter(pk__gt=last_pk)
+                .only("id", "genre")
+                .order_by("pk")[:batch_size]
+            )
+            if not batch:
+                break
+            sync_movie_genres(batch)
+            last_pk = batch[-1].pk
+            total += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"Synced genres for {total} movies."))
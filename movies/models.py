@@ -3,6 +3,22 @@ from __future__ import annotations
 from django.db import models
 
 
+class Genre(models.Model):
+    """Normalized genre parsed from OMDb's comma-separated `Genre` value.
+
+    `slug` is the lowercase lookup key used by genre filters.
+    """
+
+    name = models.CharField(max_length=50)
+    slug = models.SlugField(max_length=50, unique=True)
+
+    class Meta:
+        ordering = ("name",)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.name
+
+
 class Movie(models.Model):
     """Movie entity cached from OMDb API results."""
 
@@ -12,6 +28,7 @@ class Movie(models.Model):
     poster = models.URLField(blank=True)
     plot = models.TextField(blank=True)
     genre = models.CharField(max_length=200, blank=True)
+    genres = models.ManyToManyField(Genre, related_name="movies", blank=True)
     data = models.JSONField(default=dict, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
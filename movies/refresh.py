@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from datetime import timedelta
+from typing import List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import Movie
+from .services import _fetch_details_safe, map_omdb_to_fields, sync_movie_genres
+
+logger = logging.getLogger(__name__)
+
+OMDB_FIELDS = ["title", "year", "poster", "plot", "genre", "data"]
+# How long an enqueue marker suppresses duplicate refreshes across workers
+REFRESH_DEDUPE_TTL = 60 * 60
+
+
+def _stale_after() -> timedelta:
+    return timedelta(hours=int(getattr(settings, "MOVIE_STALE_AFTER_HOURS", 24 * 7)))
+
+
+def is_stale(movie: Movie) -> bool:
+    """True when the cached row is older than MOVIE_STALE_AFTER_HOURS."""
+    if not movie.updated_at:
+        return False
+    return movie.updated_at < timezone.now() - _stale_after()
+
+
+class MovieRefresher:
+    """Background worker refreshing stale `Movie` rows from OMDb.
+
+    Requests enqueue imdb_ids and return immediately. A single daemon thread
+    per process drains the queue in batches, spends at most
+    OMDB_REFRESH_RATE_PER_MINUTE upstream calls per minute (token bucket)
+    and writes each batch with one `bulk_update`. A short cache marker
+    dedupes enqueues across workers.
+    """
+
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+
+    @property
+    def rate_per_minute(self) -> float:
+        return max(1.0, float(getattr(settings, "OMDB_REFRESH_RATE_PER_MINUTE", 30)))
+
+    @property
+    def batch_size(self) -> int:
+        return max(1, int(getattr(settings, "OMDB_REFRESH_BATCH_SIZE", 20)))
+
+    def enqueue(self, imdb_id: str) -> bool:
+        """Queue imdb_id for refresh; returns False if already queued."""
+        marker = f"omdb:refresh:{imdb_id}"
+        with self._lock:
+            if imdb_id in self._pending:
+                return False
+            if not cache.add(marker, "1", timeout=REFRESH_DEDUPE_TTL):
+                return False
+            self._pending.add(imdb_id)
+            self._ensure_started()
+        self._queue.put(imdb_id)
+        return True
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="movie-refresher", daemon=True
+            )
+            self._thread.start()
+
+    def _take_token(self) -> None:
+        rate = self.rate_per_minute / 60.0
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self.rate_per_minute,
+                self._tokens + (now - self._last_refill) * rate,
+            )
+            self._last_refill = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            time.sleep((1.0 - self._tokens) / rate)
+
+    def _next_batch(self) -> List[str]:
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get(timeout=0.5))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                self.refresh(batch)
+            except Exception:
+                logger.exception("movie_refresh: batch failed ids=%s", batch)
+            finally:
+                with self._lock:
+                    self._pending.difference_update(batch)
+                close_old_connections()
+
+    def refresh(self, imdb_ids: List[str]) -> int:
+        """Refetch the given ids from OMDb and bulk-update them; returns count."""
+        fields_by_id = {}
+        for imdb_id in imdb_ids:
+            self._take_token()
+            payload = _fetch_details_safe(imdb_id)
+            if payload is not None:
+                fields_by_id[imdb_id] = map_omdb_to_fields(payload)
+        if not fields_by_id:
+            return 0
+        now = timezone.now()
+        rows = list(Movie.objects.filter(imdb_id__in=list(fields_by_id)))
+        for movie in rows:
+            fields = fields_by_id[movie.imdb_id]
+            for name in OMDB_FIELDS:
+                setattr(movie, name, fields[name])
+            # bulk_update bypasses auto_now
+            movie.updated_at = now
+        Movie.objects.bulk_update(rows, OMDB_FIELDS + ["updated_at"])
+        sync_movie_genres(rows)
+        logger.debug(
+            "movie_refresh: requested=%s updated=%s", len(imdb_ids), len(rows)
+        )
+        return len(rows)
+
+
+movie_refresher = MovieRefresher()
+
+
+def refresh_if_stale(movie: Movie) -> bool:
+    """Queue a background refresh when movie is stale; never blocks."""
+    if not is_stale(movie):
+        return False
+    return movie_refresher.enqueue(movie.imdb_id)
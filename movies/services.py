@@ -1,11 +1,34 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import requests
 from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.text import slugify
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .models import Genre, Movie
+
+logger = logging.getLogger(__name__)
 
 OMDB_BASE_URL = "https://www.omdbapi.com/"
+OMDB_NOT_FOUND = "Movie not found!"
+
+# Cross-worker fetch lock (needs a shared default cache, see CACHE_URL): TTL
+# bounds a crashed holder, WAIT bounds how long a follower polls for the
+# leader's row before fetching on its own.
+MOVIE_FETCH_LOCK_TTL = 15
+MOVIE_FETCH_WAIT = 10.0
+MOVIE_FETCH_POLL = 0.05
 
 
 def _api_key() -> str:
@@ -15,19 +38,167 @@ def _api_key() -> str:
     return key
 
 
+class OMDbClient:
+    """Shared HTTP client for OMDb with keep-alive pooling and retries.
+
+    The underlying `requests.Session` is built lazily on first use so that
+    settings are read once Django is configured. Retries with exponential
+    backoff apply to 429 and 5xx responses. Latency metrics are kept
+    in-process and exposed via `stats()`.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, base_url: str = OMDB_BASE_URL) -> None:
+        self.base_url = base_url
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._errors = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._last_ms = 0.0
+
+    def _build_session(self) -> requests.Session:
+        pool_size = int(getattr(settings, "OMDB_POOL_SIZE", 20))
+        retry = Retry(
+            total=int(getattr(settings, "OMDB_MAX_RETRIES", 3)),
+            backoff_factor=float(getattr(settings, "OMDB_RETRY_BACKOFF", 0.3)),
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        return (
+            float(getattr(settings, "OMDB_CONNECT_TIMEOUT", 3.05)),
+            float(getattr(settings, "OMDB_READ_TIMEOUT", 10)),
+        )
+
+    def get(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Issue a GET against OMDb with the API key and return the JSON body."""
+        query = {"apikey": _api_key(), **params}
+        started = time.perf_counter()
+        ok = False
+        try:
+            resp = self.session.get(self.base_url, params=query, timeout=self.timeout)
+            data = resp.json()
+            ok = True
+            return data
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            self._record(elapsed_ms, ok)
+            logger.debug(
+                "omdb call params=%s ok=%s elapsed_ms=%.1f",
+                sorted(params.keys()),
+                ok,
+                elapsed_ms,
+            )
+
+    def _record(self, elapsed_ms: float, ok: bool) -> None:
+        with self._lock:
+            self._calls += 1
+            if not ok:
+                self._errors += 1
+            self._total_ms += elapsed_ms
+            self._last_ms = elapsed_ms
+            if elapsed_ms > self._max_ms:
+                self._max_ms = elapsed_ms
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of call counts and latency (milliseconds)."""
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "errors": self._errors,
+                "avg_ms": (self._total_ms / self._calls) if self._calls else 0.0,
+                "max_ms": self._max_ms,
+                "last_ms": self._last_ms,
+            }
+
+
+omdb_client = OMDbClient()
+
+
+_search_cache_lock = threading.Lock()
+_search_cache_counters = {"hits": 0, "misses": 0, "negative_hits": 0}
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
+
+def _search_cache_key(query: str, page: int) -> str:
+    digest = hashlib.sha1(_normalize_query(query).encode("utf-8")).hexdigest()
+    return f"omdb:search:{digest}:{page}"
+
+
+def _count_search(counter: str) -> None:
+    with _search_cache_lock:
+        _search_cache_counters[counter] += 1
+
+
+def search_cache_stats() -> Dict[str, int]:
+    """Return in-process hit/miss counters for the OMDb search cache."""
+    with _search_cache_lock:
+        return dict(_search_cache_counters)
+
+
 def search_movies(query: str, page: int = 1) -> Dict[str, Any]:
-    """Search movies via OMDb API."""
-    params = {"apikey": _api_key(), "s": query, "page": page}
-    resp = requests.get(OMDB_BASE_URL, params=params, timeout=15)
-    data = resp.json()
+    """Search movies via OMDb API.
+
+    Read-through cached on normalized query and page. "Movie not found!"
+    responses are cached with the shorter negative TTL; other errors
+    (quota, bad key) are never cached.
+    """
+    key = _search_cache_key(query, page)
+    cached = cache.get(key)
+    if cached is not None:
+        _count_search("hits")
+        if cached.get("Response") == "False":
+            _count_search("negative_hits")
+        return cached
+    _count_search("misses")
+    data = omdb_client.get({"s": _normalize_query(query), "page": page})
+    if isinstance(data, dict):
+        if data.get("Response") == "False":
+            if data.get("Error") == OMDB_NOT_FOUND:
+                cache.set(
+                    key,
+                    data,
+                    timeout=int(getattr(settings, "OMDB_SEARCH_NEGATIVE_TTL", 10 * 60)),
+                )
+        else:
+            cache.set(
+                key,
+                data,
+                timeout=int(getattr(settings, "OMDB_SEARCH_CACHE_TTL", 6 * 60 * 60)),
+            )
     return data
 
 
 def get_movie_details(imdb_id: str) -> Dict[str, Any]:
     """Get movie details by IMDB ID via OMDb API."""
-    params = {"apikey": _api_key(), "i": imdb_id, "plot": "full"}
-    resp = requests.get(OMDB_BASE_URL, params=params, timeout=15)
-    return resp.json()
+    return omdb_client.get({"i": imdb_id, "plot": "full"})
 
 
 def map_omdb_to_fields(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -41,3 +212,194 @@ def map_omdb_to_fields(payload: Dict[str, Any]) -> Dict[str, Any]:
         "genre": payload.get("Genre", ""),
         "data": payload,
     }
+
+
+def parse_genres(value: str) -> List[str]:
+    """Split OMDb's comma-separated genre string into clean names."""
+    names = []
+    for part in (value or "").split(","):
+        name = part.strip()
+        if name and name.upper() != "N/A" and slugify(name):
+            names.append(name)
+    return names
+
+
+def genre_slugs(names: Iterable[str]) -> List[str]:
+    """Normalize user-supplied genre names to `Genre.slug` lookup keys."""
+    return [s for s in (slugify(n.strip()) for n in names) if s]
+
+
+def sync_movie_genres(movies: Iterable[Movie]) -> None:
+    """Rebuild the Movie-Genre links for movies from their `genre` strings.
+
+    Uses one bulk insert for new genres and one for the link rows.
+    """
+    movies = [m for m in movies if m.pk]
+    if not movies:
+        return
+    wanted = {m.pk: {slugify(n): n for n in parse_genres(m.genre)} for m in movies}
+    all_names: Dict[str, str] = {}
+    for by_slug in wanted.values():
+        all_names.update(by_slug)
+    if all_names:
+        Genre.objects.bulk_create(
+            [Genre(name=name, slug=slug) for slug, name in all_names.items()],
+            ignore_conflicts=True,
+        )
+    genre_ids = dict(
+        Genre.objects.filter(slug__in=list(all_names)).values_list("slug", "id")
+    )
+    through = Movie.genres.through
+    through.objects.filter(movie_id__in=list(wanted)).delete()
+    through.objects.bulk_create(
+        [
+            through(movie_id=movie_id, genre_id=genre_ids[slug])
+            for movie_id, by_slug in wanted.items()
+            for slug in by_slug
+            if slug in genre_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+
+_flight_guard = threading.Lock()
+_flight_locks: Dict[str, list] = {}
+
+
+@contextmanager
+def _flight_lock(key: str) -> Iterator[None]:
+    """Per-process single-flight lock; entries are dropped when unused."""
+    with _flight_guard:
+        entry = _flight_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _flight_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                _flight_locks.pop(key, None)
+
+
+def _cache_is_shared() -> bool:
+    return not isinstance(caches["default"], LocMemCache)
+
+
+def _acquire_fetch_lock(lock_key: str, imdb_id: str) -> tuple[bool, Optional[Movie]]:
+    """Take the cross-worker lock or wait for the holder's row to appear.
+
+    `cache.add` is only atomic across workers on a shared backend. With the
+    per-process LocMemCache the lock would merely repeat `_flight_lock`, so
+    it is skipped and concurrent workers fall back to `get_or_create`.
+    """
+    if not _cache_is_shared():
+        return False, None
+    if cache.add(lock_key, "1", timeout=MOVIE_FETCH_LOCK_TTL):
+        return True, None
+    deadline = time.monotonic() + MOVIE_FETCH_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(MOVIE_FETCH_POLL)
+        movie = Movie.objects.filter(imdb_id=imdb_id).first()
+        if movie:
+            return False, movie
+        if cache.add(lock_key, "1", timeout=MOVIE_FETCH_LOCK_TTL):
+            return True, None
+    logger.warning("movie fetch lock wait expired imdb_id=%s", imdb_id)
+    return False, None
+
+
+def get_or_fetch_movie(imdb_id: str) -> Optional[Movie]:
+    """Return the cached `Movie` for imdb_id, fetching it from OMDb if missing.
+
+    Concurrent misses are coalesced: threads in this process share a lock
+    per imdb_id, and with a shared default cache (`CACHE_URL`) workers
+    coordinate through a cache lock, so N simultaneous misses result in one
+    OMDb call and one insert. Without it each worker may fetch once, and
+    `get_or_create` keeps the insert unique. Returns None when OMDb does
+    not know the title.
+    """
+    movie = Movie.objects.filter(imdb_id=imdb_id).first()
+    if movie:
+        return movie
+    with _flight_lock(imdb_id):
+        movie = Movie.objects.filter(imdb_id=imdb_id).first()
+        if movie:
+            return movie
+        lock_key = f"omdb:movie-lock:{imdb_id}"
+        acquired, movie = _acquire_fetch_lock(lock_key, imdb_id)
+        if movie:
+            return movie
+        try:
+            payload = get_movie_details(imdb_id)
+            if not payload or payload.get("Response") == "False":
+                logger.debug("get_or_fetch_movie: OMDb miss imdb_id=%s", imdb_id)
+                return None
+            fields = map_omdb_to_fields(payload)
+            fields.pop("imdb_id", None)
+            movie, created = Movie.objects.get_or_create(
+                imdb_id=imdb_id,
+                defaults=fields,
+            )
+            if created:
+                sync_movie_genres([movie])
+            logger.debug(
+                "get_or_fetch_movie: imdb_id=%s created=%s", imdb_id, created
+            )
+            return movie
+        finally:
+            if acquired:
+                cache.delete(lock_key)
+
+
+def _fetch_details_safe(imdb_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        payload = get_movie_details(imdb_id)
+    except Exception:
+        logger.exception("hydrate_movies: OMDb fetch failed imdb_id=%s", imdb_id)
+        return None
+    if not payload or payload.get("Response") == "False":
+        return None
+    return payload
+
+
+def hydrate_movies(imdb_ids: Iterable[str]) -> Dict[str, Movie]:
+    """Ensure a batch of movies exists locally and return them by imdb_id.
+
+    Existing rows are loaded with one query; missing ids are fetched from
+    OMDb concurrently (bounded by OMDB_HYDRATE_WORKERS) and inserted with a
+    single `bulk_create(ignore_conflicts=True)`. Ids unknown to OMDb are
+    absent from the result.
+    """
+    ids = list(dict.fromkeys(i.strip() for i in imdb_ids if i and i.strip()))
+    if not ids:
+        return {}
+    found = {m.imdb_id: m for m in Movie.objects.filter(imdb_id__in=ids)}
+    missing = [i for i in ids if i not in found]
+    if not missing:
+        return found
+
+    workers = max(1, min(int(getattr(settings, "OMDB_HYDRATE_WORKERS", 8)), len(missing)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        payloads = list(pool.map(_fetch_details_safe, missing))
+
+    to_create = []
+    for imdb_id, payload in zip(missing, payloads):
+        if payload is None:
+            continue
+        fields = map_omdb_to_fields(payload)
+        fields["imdb_id"] = imdb_id
+        to_create.append(Movie(**fields))
+    if to_create:
+        Movie.objects.bulk_create(to_create, ignore_conflicts=True)
+        # ignore_conflicts does not return primary keys; reload the batch
+        created = list(Movie.objects.filter(imdb_id__in=[m.imdb_id for m in to_create]))
+        sync_movie_genres(created)
+        found.update({m.imdb_id: m for m in created})
+    logger.debug(
+        "hydrate_movies: requested=%s existing=%s fetched=%s",
+        len(ids),
+        len(ids) - len(missing),
+        len(to_create),
+    )
+    return found
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
-from django.db.models import Count
+from django.db.models import F
 import logging
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.pagination import CursorPagination
 from rest_framework.throttling import ScopedRateThrottle
 
 from .models import Movie
 from .serializers import MovieSerializer
-from .services import search_movies, get_movie_details, map_omdb_to_fields
+from .refresh import refresh_if_stale
+from .services import search_movies, get_or_fetch_movie
 from notifications.services import gemini_summarize_reviews
 from social.models import Review
 
@@ -45,7 +47,11 @@ class MovieSearchView(APIView):
 
 
 class MovieDetailView(RetrieveAPIView):
-    """Return movie details, caching in DB if necessary."""
+    """Return movie details, caching in DB if necessary.
+
+    Stale rows are served as-is and queued for a background OMDb refresh
+    (stale-while-revalidate).
+    """
 
     serializer_class = MovieSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -54,31 +60,34 @@ class MovieDetailView(RetrieveAPIView):
 
     def get_object(self):
         imdb_id = self.kwargs.get("imdb_id")
-        movie = Movie.objects.filter(imdb_id=imdb_id).first()
-        if movie:
-            return movie
-        # fetch and cache
-        payload = get_movie_details(imdb_id)
-        if not payload or payload.get("Response") == "False":
-            raise get_object_or_404(Movie, pk=0)  # force 404
-        fields = map_omdb_to_fields(payload)
-        movie = Movie.objects.create(**fields)
+        movie = get_or_fetch_movie(imdb_id)
+        if not movie:
+            raise Http404("Movie not found.")
+        refresh_if_stale(movie)
         return movie
 
 
+class PopularMoviesPagination(CursorPagination):
+    """Cursor pagination over the indexed popularity ranking."""
+
+    ordering = ("-popularity", "-id")
+    page_size = 20
+
+
 class PopularMoviesView(ListAPIView):
-    """List popular movies based on likes and favorites counts."""
+    """List trending movies by time-decayed popularity.
+
+    Scores live in `MovieStats.popularity` and are materialized by the
+    `refresh_popularity` command; this view only reads the index.
+    """
 
     serializer_class = MovieSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PopularMoviesPagination
 
     def get_queryset(self):
-        return (
-            Movie.objects.annotate(
-                favorites_count=Count("favorites", distinct=True),
-                likes_count=Count("likes", distinct=True),
-            )
-            .order_by("-favorites_count", "-likes_count", "-updated_at")
+        return Movie.objects.filter(stats__isnull=False).annotate(
+            popularity=F("stats__popularity")
         )
 
 
@@ -100,14 +109,12 @@ class ReviewSummaryView(APIView):
         )
         if not movie:
             # attempt to fetch and cache
-            payload = get_movie_details(imdb_id)
-            if not payload or payload.get("Response") == "False":
+            m = get_or_fetch_movie(imdb_id)
+            if not m:
                 return Response(
                     {"detail": "Movie not found."},
                     status=status.HTTP_404_NOT_FOUND,
                 )
-            fields = map_omdb_to_fields(payload)
-            m = Movie.objects.create(**fields)
             movie = {
                 "imdb_id": m.imdb_id,
                 "title": m.title,
@@ -16,6 +16,9 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ("-sent_at",)
+        indexes = [
+            models.Index(fields=["user", "-sent_at", "-id"], name="notification_user_feed_idx"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.title} -> {self.user}"
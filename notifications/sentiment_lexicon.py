@@ -0,0 +1,52 @@
+"""
+Word lists for the local, first-tier review sentiment classifier.
+
+Weights are on a 1 (mild) .. 3 (strong) scale and tuned for movie
+reviews; negators flip the polarity of the next few words and intensifiers
+scale the next sentiment word.
+"""
+
+POSITIVE = {
+    "amazing": 3, "awesome": 3, "beautiful": 2, "beautifully": 2, "best": 3,
+    "brilliant": 3, "brilliantly": 3, "captivating": 2, "charming": 2,
+    "classic": 2, "clever": 2, "compelling": 2, "delight": 2, "delightful": 2,
+    "enjoy": 2, "enjoyable": 2, "enjoyed": 2, "entertaining": 2, "epic": 2,
+    "excellent": 3, "exceptional": 3, "fantastic": 3, "fascinating": 2,
+    "favorite": 2, "favourite": 2, "fun": 2, "funny": 1, "gem": 2, "genius": 3,
+    "good": 1, "gorgeous": 2, "great": 2, "gripping": 2, "happy": 1,
+    "heartwarming": 2, "hilarious": 2, "impressive": 2, "incredible": 3,
+    "inspiring": 2, "love": 3, "loved": 3, "lovely": 2, "loves": 3,
+    "magnificent": 3, "marvelous": 3, "masterful": 3, "masterpiece": 3,
+    "memorable": 2, "moving": 2, "must-see": 3, "nice": 1, "outstanding": 3,
+    "perfect": 3, "perfectly": 2, "phenomenal": 3, "pleasant": 1, "powerful": 2,
+    "recommend": 2, "recommended": 2, "refreshing": 2, "remarkable": 2,
+    "riveting": 2, "satisfying": 2, "solid": 1, "spectacular": 3, "strong": 1,
+    "stunning": 3, "superb": 3, "surprising": 1, "thrilling": 2, "touching": 2,
+    "wonderful": 3, "wonderfully": 3, "worth": 1, "wow": 2,
+}
+
+NEGATIVE = {
+    "annoying": 2, "awful": 3, "bad": 2, "badly": 2, "bland": 2, "boring": 3,
+    "bored": 2, "cheap": 1, "cliche": 1, "cliched": 2, "confusing": 2,
+    "cringe": 2, "cringey": 2, "disappointed": 2, "disappointing": 3,
+    "disappointment": 3, "disaster": 3, "dreadful": 3, "dull": 2, "forgettable": 2,
+    "garbage": 3, "hate": 3, "hated": 3, "horrible": 3, "lame": 2, "lazy": 2,
+    "mediocre": 2, "mess": 2, "messy": 1, "meh": 1, "nonsense": 2, "overrated": 2,
+    "pathetic": 3, "pointless": 2, "poor": 2, "poorly": 2, "predictable": 1,
+    "ridiculous": 2, "rubbish": 3, "sad": 1, "shallow": 2, "slow": 1, "stupid": 2,
+    "terrible": 3, "tedious": 2, "trash": 3, "unwatchable": 3, "waste": 3,
+    "wasted": 3, "weak": 2, "worse": 2, "worst": 3,
+}
+
+NEGATORS = {
+    "not", "no", "never", "nothing", "hardly", "barely", "without", "nor",
+    "isn't", "wasn't", "aren't", "weren't", "don't", "doesn't", "didn't",
+    "can't", "couldn't", "won't", "wouldn't", "shouldn't", "isnt", "wasnt",
+    "dont", "doesnt", "didnt", "cant", "couldnt", "wont",
+}
+
+INTENSIFIERS = {
+    "very": 1.5, "really": 1.5, "highly": 1.5, "so": 1.3, "extremely": 2.0,
+    "incredibly": 2.0, "absolutely": 2.0, "truly": 1.5, "totally": 1.5,
+    "super": 1.5, "quite": 1.2,
+}
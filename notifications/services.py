@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Any, Optional, Dict, List
 
 from django.conf import settings
-from django.core.cache import cache
+from django.core.cache import InvalidCacheBackendError, cache, caches
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+import hashlib
 import json
 import logging
+import math
+import re
+import threading
 logger = logging.getLogger(__name__)
 
+from .models import Notification
+from .sentiment_lexicon import INTENSIFIERS, NEGATIVE, NEGATORS, POSITIVE
+
 try:
     from pyfcm import FCMNotification  # type: ignore
 except Exception:  # pragma: no cover - optional dependency at runtime
@@ -19,6 +29,20 @@ except Exception:  # pragma: no cover
     genai = None  # type: ignore
 
 
+def recently_notified(hours: int = 24, user_ref: str = "pk") -> Exists:
+    """`EXISTS` filter: the outer user got a notification in the last `hours`.
+
+    Use negated to drop recently notified users from an audience query,
+    e.g. `User.objects.filter(~recently_notified())`. Evaluated per
+    candidate against the (user, -sent_at) index, so cost scales with the
+    audience rather than with recent notification volume.
+    """
+    cutoff = timezone.now() - timedelta(hours=hours)
+    return Exists(
+        Notification.objects.filter(user_id=OuterRef(user_ref), sent_at__gte=cutoff)
+    )
+
+
 def push_notify(
     device_token: str,
     title: str,
@@ -42,18 +66,206 @@ def push_notify(
     return bool(resp)
 
 
+GEMINI_FLASH_MODEL = "gemini-1.5-flash"
+GEMINI_PRO_MODEL = "gemini-1.5-pro"
+
+
+class GeminiClientRegistry:
+    """Process-wide Gemini setup: configure once, reuse model handles.
+
+    `genai.configure` is called the first time a model is requested and
+    again only if `GEMINI_API_KEY` changes, which also drops the cached
+    handles. Handles are keyed by model name and generation config and
+    shared between threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._api_key: Optional[str] = None
+        self._models: Dict[tuple, Any] = {}
+
+    @property
+    def configured(self) -> bool:
+        return bool(genai and getattr(settings, "GEMINI_API_KEY", ""))
+
+    @staticmethod
+    def _config_key(generation_config: Optional[Dict[str, Any]]) -> str:
+        return json.dumps(generation_config or {}, sort_keys=True, default=str)
+
+    def model(self, name: str, generation_config: Optional[Dict[str, Any]] = None):
+        """Return the shared `GenerativeModel` for name and config."""
+        api_key = getattr(settings, "GEMINI_API_KEY", "")
+        key = (name, self._config_key(generation_config))
+        handle = self._models.get(key)
+        if handle is not None and api_key == self._api_key:
+            return handle
+        with self._lock:
+            if api_key != self._api_key:
+                genai.configure(api_key=api_key)
+                self._api_key = api_key
+                self._models.clear()
+                logger.debug("gemini_clients: configured")
+            handle = self._models.get(key)
+            if handle is None:
+                if generation_config:
+                    handle = genai.GenerativeModel(name, generation_config=generation_config)
+                else:
+                    handle = genai.GenerativeModel(name)
+                self._models[key] = handle
+                logger.debug("gemini_clients: built model=%s", name)
+            return handle
+
+    def warm(self, names=(GEMINI_FLASH_MODEL, GEMINI_PRO_MODEL)) -> None:
+        """Configure and build handles up front; no network call is made."""
+        if not self.configured:
+            return
+        for name in names:
+            self.model(name)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._api_key = None
+            self._models.clear()
+
+
+gemini_clients = GeminiClientRegistry()
+
+
+SENTIMENT_LABEL_MODEL = GEMINI_FLASH_MODEL
+SENTIMENT_ADVANCED_MODEL = GEMINI_PRO_MODEL
+SENTIMENT_CACHE_ALIAS = "sentiment"
+_REPEATED_PUNCT = re.compile(r"([!?.,])\1+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _sentiment_cache():
+    """Dedicated size-bounded cache for sentiment results, else the default."""
+    try:
+        return caches[SENTIMENT_CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return cache
+
+
+def _sentiment_cache_key(kind: str, model: str, text: str) -> str:
+    """Key on a hash of normalized text so trivially different copies
+    ("Great movie!" / "great  movie!!!") share one result."""
+    normalized = _REPEATED_PUNCT.sub(r"\1", _WHITESPACE.sub(" ", text.lower())).strip()
+    digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    return f"sentiment:{kind}:{model}:{digest}"
+
+
+_TOKEN = re.compile(r"[a-z][a-z'-]*|[.,!?;:]")
+# A negator flips the next sentiment word within this many tokens, up to
+# the end of the clause; flipped words count half ("not bad" is mild)
+NEGATION_WINDOW = 3
+NEGATED_WEIGHT = 0.5
+
+
+def lexicon_sentiment(text: str) -> Dict[str, Any]:
+    """Score text against the bundled lexicon; runs offline in microseconds.
+
+    Returns dict: overall, confidence (0..1), score (signed sum) and hits.
+    Confidence grows with the total matched weight and drops when positive
+    and negative cues disagree.
+    """
+    pos = neg = 0.0
+    hits = 0
+    negate_left = 0
+    boost = 1.0
+    for token in _TOKEN.findall((text or "").lower()):
+        if token in ".,!?;:":
+            negate_left = 0
+            boost = 1.0
+            continue
+        if token in NEGATORS:
+            negate_left = NEGATION_WINDOW
+            continue
+        if token in INTENSIFIERS:
+            boost = INTENSIFIERS[token]
+            continue
+        weight = POSITIVE.get(token, 0) - NEGATIVE.get(token, 0)
+        if weight:
+            weight *= boost * (-NEGATED_WEIGHT if negate_left else 1)
+            if weight > 0:
+                pos += weight
+            else:
+                neg -= weight
+            hits += 1
+            negate_left = 0
+        boost = 1.0
+        negate_left = max(0, negate_left - 1)
+    total = pos + neg
+    if not total:
+        return {"overall": "neutral", "confidence": 0.0, "score": 0.0, "hits": 0}
+    polarity = (pos - neg) / total
+    confidence = abs(polarity) * (1.0 - math.exp(-total / 2.0))
+    overall = "neutral"
+    if polarity > 0.2:
+        overall = "positive"
+    elif polarity < -0.2:
+        overall = "negative"
+    return {
+        "overall": overall,
+        "confidence": round(confidence, 3),
+        "score": round(pos - neg, 3),
+        "hits": hits,
+    }
+
+
+def _lexicon_threshold() -> float:
+    return float(getattr(settings, "SENTIMENT_LEXICON_THRESHOLD", 0.75))
+
+
+def _routing(tier: str, lexicon: Dict[str, Any], reason: str) -> Dict[str, Any]:
+    return {
+        "tier": tier,
+        "reason": reason,
+        "lexicon_confidence": lexicon["confidence"],
+        "lexicon_score": lexicon["score"],
+        "threshold": _lexicon_threshold(),
+    }
+
+
+def _lexicon_result(lexicon: Dict[str, Any], reason: str) -> Dict[str, Any]:
+    """Advanced-sentiment shaped result answered by the lexicon tier."""
+    return {
+        "overall": lexicon["overall"],
+        "confidence": lexicon["confidence"],
+        "emotions": {},
+        "breakdown": {
+            "pros": [],
+            "cons": [],
+            "themes": [],
+            "routing": _routing("lexicon", lexicon, reason),
+        },
+    }
+
+
+def _with_llm_routing(data: Dict[str, Any], lexicon: Dict[str, Any]) -> Dict[str, Any]:
+    breakdown = data.get("breakdown")
+    breakdown = dict(breakdown) if isinstance(breakdown, dict) else {}
+    breakdown["routing"] = _routing("llm", lexicon, "below_threshold")
+    return {**data, "breakdown": breakdown}
+
+
 def gemini_analyze_sentiment(text: str) -> str:
     """Use Gemini LLM to analyze sentiment for given text.
 
-    Returns 'positive', 'neutral', or 'negative'. Falls back to 'neutral'
-    when not configured.
+    Returns 'positive', 'neutral', or 'negative'. Confident lexicon scores
+    skip the LLM; when Gemini is not configured or fails the lexicon label
+    is returned.
     """
-    api_key = getattr(settings, "GEMINI_API_KEY", "")
-    if not api_key or not genai or not text:
+    if not text:
         return "neutral"
+    lexicon = lexicon_sentiment(text)
+    if not gemini_clients.configured or lexicon["confidence"] >= _lexicon_threshold():
+        return lexicon["overall"]
+    key = _sentiment_cache_key("label", SENTIMENT_LABEL_MODEL, text)
+    cached = _sentiment_cache().get(key)
+    if cached is not None:
+        return cached
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-flash")
+        model = gemini_clients.model(SENTIMENT_LABEL_MODEL)
         prompt = (
             "Classify the sentiment of the following review as strictly one of: "
             "positive, neutral, negative.\n"
@@ -61,25 +273,19 @@ def gemini_analyze_sentiment(text: str) -> str:
         )
         res = model.generate_content(prompt)
         out = (res.text or "").strip().lower()
+        label = "neutral"
         if "positive" in out:
-            return "positive"
-        if "negative" in out:
-            return "negative"
-        return "neutral"
+            label = "positive"
+        elif "negative" in out:
+            label = "negative"
+        _sentiment_cache().set(key, label)
+        return label
     except Exception:
-        return "neutral"
+        return lexicon["overall"]
 
 
 def _gemini_configured() -> bool:
-    api_key = getattr(settings, "GEMINI_API_KEY", "")
-    ok = bool(api_key and genai)
-    logger.debug(
-        "_gemini_configured ok=%s api_key_present=%s genai_loaded=%s",
-        ok,
-        bool(api_key),
-        bool(genai),
-    )
-    return ok
+    return gemini_clients.configured
 
 
 def _safe_json_from_text(text: str) -> Any:
@@ -126,8 +332,7 @@ def gemini_generate_recommendations(user_id: int, context: Dict[str, Any]) -> Li
         logger.debug("reco not configured, returning empty list")
         return []
     try:
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        model = genai.GenerativeModel("gemini-1.5-flash")
+        model = gemini_clients.model(GEMINI_FLASH_MODEL)
         prompt = (
             "You are a movie recommender. Given user's favorites, liked genres, "
             "and review sentiments, propose 5 diverse movie recommendations.\n"
@@ -163,24 +368,35 @@ def gemini_advanced_sentiment(text: str) -> Dict[str, Any]:
       confidence: float 0..1,
       emotions: { excited, disappointed, nostalgic, joyful, sad, angry,
         fearful, surprised } scores 0..1,
-      breakdown: { pros: [..], cons: [..], themes: [..] }
+      breakdown: { pros: [..], cons: [..], themes: [..], routing: {..} }
     }
+
+    The local lexicon answers first; the LLM is only called when its
+    confidence is below SENTIMENT_LEXICON_THRESHOLD. `breakdown.routing`
+    records which tier answered and why.
     """
-    if not _gemini_configured() or not text:
-        logger.debug(
-            "adv_sentiment skipped configured=%s has_text=%s",
-            _gemini_configured(),
-            bool(text),
-        )
+    if not text:
         return {
             "overall": "neutral",
             "confidence": 0.5,
             "emotions": {},
             "breakdown": {"pros": [], "cons": [], "themes": []},
         }
+    lexicon = lexicon_sentiment(text)
+    if not _gemini_configured():
+        logger.debug("adv_sentiment lexicon only: gemini not configured")
+        return _lexicon_result(lexicon, "llm_unavailable")
+    if lexicon["confidence"] >= _lexicon_threshold():
+        logger.debug("adv_sentiment lexicon hit conf=%s", lexicon["confidence"])
+        return _lexicon_result(lexicon, "confident")
+    key = _sentiment_cache_key("advanced", SENTIMENT_ADVANCED_MODEL, text)
+    cached = _sentiment_cache().get(key)
+    cached = _normalize_advanced(cached) if isinstance(cached, dict) else None
+    if cached is not None:
+        logger.debug("adv_sentiment cache hit")
+        return _with_llm_routing(cached, lexicon)
     try:
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        model = genai.GenerativeModel("gemini-1.5-pro")
+        model = gemini_clients.model(SENTIMENT_ADVANCED_MODEL)
         prompt = (
             "Analyze the movie review below. Return strict JSON with keys: "
             "overall, confidence, emotions, breakdown.\n"
@@ -196,22 +412,170 @@ def gemini_advanced_sentiment(text: str) -> Dict[str, Any]:
         text_out = getattr(res, "text", "") or ""
         logger.debug("adv_sentiment response_text_len=%s", len(text_out))
         data = _safe_json_from_text(text_out)
-        if isinstance(data, dict):
+        parsed = _normalize_advanced(data) if isinstance(data, dict) else None
+        if parsed is not None:
             logger.debug(
                 "adv_sentiment parsed keys=%s",
                 sorted(list(data.keys())),
             )
-            return data
+            _sentiment_cache().set(key, parsed)
+            return _with_llm_routing(parsed, lexicon)
+        logger.debug("adv_sentiment unusable response; using lexicon label")
     except Exception as e:  # pragma: no cover
         logging.exception("gemini_advanced_sentiment failed: %s", e)
+    return _lexicon_result(lexicon, "llm_error")
+
+
+def review_sentiment(text: str) -> Dict[str, Any]:
+    """Sentiment fields for a review: advanced analysis, falling back to the
+    lexicon label when the advanced call returns no valid `overall`.
+
+    Returns dict with overall, confidence, emotions, breakdown; `overall` is
+    always one of SENTIMENT_LABELS.
+    """
+    adv = gemini_advanced_sentiment(text)
+    parsed = _normalize_advanced(adv) if isinstance(adv, dict) else None
+    if parsed is None:
+        parsed = {
+            "overall": lexicon_sentiment(text)["overall"],
+            "confidence": adv.get("confidence") if isinstance(adv, dict) else None,
+            "emotions": {},
+            "breakdown": {},
+        }
+    return parsed
+
+
+SENTIMENT_LABELS = ("positive", "neutral", "negative")
+
+
+def _normalize_advanced(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Coerce one parsed advanced-sentiment object; None if unusable."""
+    overall = str(data.get("overall") or "").strip().lower()
+    if overall not in SENTIMENT_LABELS:
+        return None
+    try:
+        confidence = float(data.get("confidence"))
+    except (TypeError, ValueError):
+        confidence = None
+    emotions = data.get("emotions")
+    breakdown = data.get("breakdown")
     return {
-        "overall": "neutral",
-        "confidence": 0.5,
-        "emotions": {},
-        "breakdown": {"pros": [], "cons": [], "themes": []},
+        "overall": overall,
+        "confidence": confidence,
+        "emotions": emotions if isinstance(emotions, dict) else {},
+        "breakdown": breakdown if isinstance(breakdown, dict) else {},
     }
 
 
+def _advanced_sentiment_chunk(chunk: List[tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+    """One Gemini call for a chunk of (id, text); returns parsed results by id."""
+    model = gemini_clients.model(SENTIMENT_ADVANCED_MODEL)
+    payload = [{"id": key, "text": text} for key, text in chunk]
+    prompt = (
+        "Analyze each movie review in the JSON array below. Return a strict "
+        "JSON array with exactly one object per review, each with keys: "
+        "id, overall, confidence, emotions, breakdown.\n"
+        "id must be copied verbatim from the input.\n"
+        "overall must be one of: positive, neutral, negative.\n"
+        "confidence is 0..1.\n"
+        "emotions is an object with scores 0..1 for keys: excited, "
+        "disappointed, nostalgic, joyful, sad, angry, fearful, surprised.\n"
+        "breakdown contains arrays pros, cons, themes (short phrases).\n\n"
+        f"Reviews (JSON array):\n{json.dumps(payload)}"
+    )
+    logger.debug("adv_sentiment_batch calling Gemini items=%s", len(chunk))
+    res = model.generate_content(prompt)
+    data = _safe_json_from_text(getattr(res, "text", "") or "")
+    wanted = {key for key, _ in chunk}
+    out: Dict[str, Dict[str, Any]] = {}
+    if isinstance(data, list):
+        for item in data:
+            if not isinstance(item, dict) or str(item.get("id")) not in wanted:
+                continue
+            parsed = _normalize_advanced(item)
+            if parsed is not None:
+                out[str(item["id"])] = parsed
+    logger.debug(
+        "adv_sentiment_batch parsed=%s of %s", len(out), len(chunk)
+    )
+    return out
+
+
+def gemini_advanced_sentiment_batch(
+    items: Dict[str, str], batch_size: int = 20
+) -> Dict[str, Dict[str, Any]]:
+    """Advanced sentiment for many texts, up to `batch_size` per LLM call.
+
+    `items` maps a stable id to review text. Each chunk is sent as one
+    prompt whose JSON array answer is matched back by id; ids missing from
+    the answer or failing to parse are retried one by one through
+    `review_sentiment`. When the whole chunk call fails (rate limit, quota,
+    timeout) its items get the lexicon result instead, so a failing API is
+    not hit again per review. Returns the `review_sentiment` shape per id.
+
+    Results are read from and written to the same content-hash cache as
+    `gemini_advanced_sentiment`, so only uncached texts reach the LLM.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    lexicons: Dict[str, Dict[str, Any]] = {}
+    keyed = []
+    threshold = _lexicon_threshold()
+    for key, text in items.items():
+        if not text:
+            continue
+        lexicon = lexicon_sentiment(text)
+        if lexicon["confidence"] >= threshold:
+            results[str(key)] = _lexicon_result(lexicon, "confident")
+        else:
+            lexicons[str(key)] = lexicon
+            keyed.append((str(key), text))
+    if keyed and _gemini_configured():
+        store = _sentiment_cache()
+        cache_keys = {
+            key: _sentiment_cache_key("advanced", SENTIMENT_ADVANCED_MODEL, text)
+            for key, text in keyed
+        }
+        hits = store.get_many(list(set(cache_keys.values())))
+        for key, ckey in cache_keys.items():
+            parsed = _normalize_advanced(hits[ckey]) if isinstance(hits.get(ckey), dict) else None
+            if parsed is not None:
+                results[key] = _with_llm_routing(parsed, lexicons[key])
+        # identical texts in one call are analyzed once and fanned out
+        same_text: Dict[str, List[str]] = {}
+        misses = []
+        for key, text in keyed:
+            if key in results:
+                continue
+            group = same_text.setdefault(cache_keys[key], [])
+            if not group:
+                misses.append((key, text))
+            group.append(key)
+        logger.debug(
+            "adv_sentiment_batch cache hits=%s misses=%s", len(results), len(misses)
+        )
+        size = max(1, batch_size)
+        for start in range(0, len(misses), size):
+            chunk = misses[start:start + size]
+            try:
+                parsed_chunk = _advanced_sentiment_chunk(chunk)
+            except Exception:
+                # 429/quota/timeout: answer the chunk locally instead of
+                # retrying each review against an API that is failing
+                logger.exception("adv_sentiment_batch chunk failed items=%s", len(chunk))
+                for key, _ in chunk:
+                    for same in same_text[cache_keys[key]]:
+                        results[same] = _lexicon_result(lexicons[same], "llm_error")
+                continue
+            for key, value in parsed_chunk.items():
+                for same in same_text[cache_keys[key]]:
+                    results[same] = _with_llm_routing(value, lexicons[same])
+            store.set_many({cache_keys[key]: value for key, value in parsed_chunk.items()})
+    for key, text in items.items():
+        if str(key) not in results:
+            results[str(key)] = review_sentiment(text or "")
+    return results
+
+
 def gemini_generate_social_posts(
     movie: Dict[str, Any],
     user: Dict[str, Any],
@@ -222,8 +586,7 @@ def gemini_generate_social_posts(
         logger.debug("social_posts not configured")
         return {"twitter": "", "instagram": "", "facebook": ""}
     try:
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        model = genai.GenerativeModel("gemini-1.5-flash")
+        model = gemini_clients.model(GEMINI_FLASH_MODEL)
         prompt = (
             "Create engaging social posts about the movie for Twitter, "
             "Instagram, and Facebook.\n"
@@ -260,8 +623,7 @@ def gemini_generate_notification_message(user: Dict[str, Any], context: Dict[str
         logger.debug("notif_message not configured")
         return {"title": "", "body": ""}
     try:
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        model = genai.GenerativeModel("gemini-1.5-flash")
+        model = gemini_clients.model(GEMINI_FLASH_MODEL)
         prompt = (
             "Write a concise, personalized push notification for a movie app "
             "user given the context (trending movies, friend activities, etc).\n"
@@ -307,8 +669,7 @@ def gemini_summarize_reviews(
         )
         return {"summary": "", "overall_sentiment": "neutral", "key_themes": []}
     try:
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        model = genai.GenerativeModel("gemini-1.5-pro")
+        model = gemini_clients.model(GEMINI_PRO_MODEL)
         short_reviews = [r.get("content", "") for r in reviews[:50]]
         prompt = (
             "Summarize the following user reviews for the movie.\n"
@@ -344,7 +705,7 @@ def gemini_healthcheck() -> Dict[str, Any]:
     info: Dict[str, Any] = {
         "configured": _gemini_configured(),
         "success": False,
-        "model": "gemini-1.5-flash",
+        "model": GEMINI_FLASH_MODEL,
         "text_len": 0,
         "error": None,
     }
@@ -352,8 +713,7 @@ def gemini_healthcheck() -> Dict[str, Any]:
         logger.debug("healthcheck: not configured")
         return info
     try:
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        model = genai.GenerativeModel(info["model"])
+        model = gemini_clients.model(info["model"])
         res = model.generate_content("ping")
         text = getattr(res, "text", "") or ""
         info["text_len"] = len(text)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
+from movie_social_backend.pagination import KeysetPagination
 from rest_framework.views import APIView
 from rest_framework.throttling import ScopedRateThrottle
 from drf_spectacular.utils import extend_schema, OpenApiTypes
@@ -25,6 +26,8 @@ class NotificationListView(generics.ListAPIView):
 
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_field = "sent_at"
 
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user)
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import (
+    Activity,
     Favorite,
     Like,
     Review,
@@ -9,6 +10,7 @@ from .models import (
     MovieNight,
     MovieNightParticipant,
     MovieNightVote,
+    MovieStats,
 )
 
 
@@ -101,3 +103,16 @@ class MovieNightVoteAdmin(admin.ModelAdmin):
         "movie__title",
         "movie__imdb_id",
     )
+
+
+@admin.register(MovieStats)
+class MovieStatsAdmin(admin.ModelAdmin):
+    list_display = ("movie", "likes", "favorites", "reviews", "shares")
+    search_fields = ("movie__title", "movie__imdb_id")
+
+
+@admin.register(Activity)
+class ActivityAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "verb", "movie", "created_at")
+    list_filter = ("verb",)
+    search_fields = ("user__username", "movie__title", "movie__imdb_id")
@@ -1,7 +1,15 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class SocialConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "social"
     verbose_name = "Social"
+
+    def ready(self):
+        from .graph import friend_graph
+
+        # Warm the friendship graph on a worker's first request, not at
+        # import time, so management commands never touch the table
+        request_started.connect(friend_graph.warm, dispatch_uid="social.friend_graph.warm")
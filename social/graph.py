@@ -0,0 +1,266 @@
+"""
+In-memory friendship graph in CSR (compressed sparse row) form.
+
+`Friendship` stores each friendship as two directed rows. This module loads
+them once into three NumPy arrays -- sorted user ids, row offsets and the
+concatenated, sorted friend ids of every user -- so mutual-friend and
+friend-of-friend questions are answered with array intersections instead
+of ORM joins.
+
+Accepts and unfriends are applied to small per-user add/remove overlays
+and folded into the arrays once the overlay grows. Each process holds its
+own copy, warmed in the background on the worker's first request (or
+loaded by the first query, whichever comes first); writes made by other
+workers are picked up by a full reload every FRIEND_GRAPH_RELOAD_SECONDS.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import Friendship
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency at runtime
+    np = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Fold overlays into the CSR arrays after this many pending edge changes
+COMPACT_AFTER = 10_000
+
+
+class FriendGraph:
+    """Thread-safe CSR adjacency of the friendship graph."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Serializes full loads so a cold worker scans the table once
+        self._load_lock = threading.Lock()
+        self._warming = False
+        self._reloading = False
+        self._loaded_at = 0.0
+        self._ids = None
+        self._indptr = None
+        self._indices = None
+        self._added: Dict[int, Set[int]] = defaultdict(set)
+        self._removed: Dict[int, Set[int]] = defaultdict(set)
+        self._pending = 0
+        # Edge changes made while a reload is reading the table
+        self._journal: List[Tuple[bool, int, int]] | None = None
+
+    @property
+    def reload_seconds(self) -> int:
+        return int(getattr(settings, "FRIEND_GRAPH_RELOAD_SECONDS", 300))
+
+    # -- loading ---------------------------------------------------------
+
+    def load(self) -> None:
+        """(Re)build the arrays from the Friendship table."""
+        with self._load_lock:
+            self._load()
+
+    def _load(self) -> None:
+        started = time.perf_counter()
+        with self._lock:
+            self._journal = []
+        pairs = Friendship.objects.order_by().values_list("user_id", "friend_id")
+        users: List[int] = []
+        friends: List[int] = []
+        for user_id, friend_id in pairs.iterator(chunk_size=50_000):
+            users.append(user_id)
+            friends.append(friend_id)
+        arrays = self._build(
+            np.asarray(users, dtype=np.int64), np.asarray(friends, dtype=np.int64)
+        )
+        with self._lock:
+            self._ids, self._indptr, self._indices = arrays
+            self._added.clear()
+            self._removed.clear()
+            self._pending = 0
+            self._loaded_at = time.monotonic()
+            journal, self._journal = self._journal or [], None
+            for added, a, b in journal:
+                self._apply(added, a, b)
+        logger.info(
+            "friend_graph: loaded users=%s edges=%s in %.0f ms",
+            len(arrays[0]),
+            len(arrays[2]),
+            (time.perf_counter() - started) * 1000.0,
+        )
+
+    @staticmethod
+    def _build(users, friends) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        order = np.lexsort((friends, users))
+        users, friends = users[order], friends[order]
+        ids, counts = np.unique(users, return_counts=True)
+        indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return ids, indptr, friends
+
+    def _reload_in_background(self) -> None:
+        try:
+            self.load()
+        except Exception:
+            logger.exception("friend_graph: reload failed")
+        finally:
+            with self._lock:
+                self._reloading = False
+            close_old_connections()
+
+    def _ensure_loaded(self) -> None:
+        if self._ids is None:
+            with self._load_lock:
+                if self._ids is None:
+                    self._load()
+            return
+        with self._lock:
+            stale = (
+                time.monotonic() - self._loaded_at > self.reload_seconds
+                and not self._reloading
+            )
+            if stale:
+                self._reloading = True
+        if stale:
+            threading.Thread(
+                target=self._reload_in_background, name="friend-graph", daemon=True
+            ).start()
+
+    def warm(self, **kwargs) -> None:
+        """Load once per process in the background; safe to call repeatedly.
+
+        Connected to `request_started`, so the first request of a worker
+        starts the load instead of management commands doing it.
+        """
+        with self._lock:
+            if self._warming or self._ids is not None:
+                return
+            self._warming = True
+        threading.Thread(target=self._warm, name="friend-graph", daemon=True).start()
+
+    def _warm(self) -> None:
+        try:
+            self._ensure_loaded()
+        except Exception:
+            logger.exception("friend_graph: warm-up failed")
+        finally:
+            close_old_connections()
+
+    # -- incremental updates ---------------------------------------------
+
+    def add_friendship(self, a: int, b: int) -> None:
+        """Record an accepted friendship in both directions."""
+        with self._lock:
+            self._apply(True, a, b)
+            self._maybe_compact()
+
+    def remove_friendship(self, a: int, b: int) -> None:
+        """Record an unfriend in both directions."""
+        with self._lock:
+            self._apply(False, a, b)
+            self._maybe_compact()
+
+    def _apply(self, added: bool, a: int, b: int) -> None:
+        if self._journal is not None:
+            self._journal.append((added, a, b))
+        for u, v in ((a, b), (b, a)):
+            if added:
+                self._removed[u].discard(v)
+                self._added[u].add(v)
+            else:
+                self._added[u].discard(v)
+                self._removed[u].add(v)
+        self._pending += 2
+
+    def _maybe_compact(self) -> None:
+        if self._pending < COMPACT_AFTER or self._ids is None:
+            return
+        touched = set(self._added) | set(self._removed)
+        keep = np.ones(len(self._indices), dtype=bool)
+        extra_users: List[int] = []
+        extra_friends: List[int] = []
+        for u in touched:
+            row = np.searchsorted(self._ids, u)
+            if row < len(self._ids) and self._ids[row] == u:
+                keep[self._indptr[row]:self._indptr[row + 1]] = False
+            for v in self._row_ids(u).tolist():
+                extra_users.append(u)
+                extra_friends.append(v)
+        counts = np.diff(self._indptr)
+        users = np.repeat(self._ids, counts)[keep]
+        friends = self._indices[keep]
+        self._ids, self._indptr, self._indices = self._build(
+            np.concatenate([users, np.asarray(extra_users, dtype=np.int64)]),
+            np.concatenate([friends, np.asarray(extra_friends, dtype=np.int64)]),
+        )
+        self._added.clear()
+        self._removed.clear()
+        self._pending = 0
+
+    # -- queries ---------------------------------------------------------
+
+    def _row_ids(self, user_id: int) -> "np.ndarray":
+        """Sorted friend ids of user_id, overlays applied. Caller holds the lock."""
+        row = np.searchsorted(self._ids, user_id)
+        if row < len(self._ids) and self._ids[row] == user_id:
+            base = self._indices[self._indptr[row]:self._indptr[row + 1]]
+        else:
+            base = np.empty(0, dtype=np.int64)
+        added = self._added.get(user_id)
+        removed = self._removed.get(user_id)
+        if not added and not removed:
+            return base
+        out = set(base.tolist())
+        out |= added or set()
+        out -= removed or set()
+        return np.asarray(sorted(out), dtype=np.int64)
+
+    def friends(self, user_id: int) -> List[int]:
+        self._ensure_loaded()
+        with self._lock:
+            return self._row_ids(user_id).tolist()
+
+    def mutual_friends(self, a: int, b: int) -> List[int]:
+        """Sorted ids of users who are friends with both a and b."""
+        self._ensure_loaded()
+        with self._lock:
+            return np.intersect1d(
+                self._row_ids(a), self._row_ids(b), assume_unique=True
+            ).tolist()
+
+    def mutual_counts(self, user_id: int, others: Iterable[int]) -> Dict[int, int]:
+        """Number of mutual friends between user_id and each of others."""
+        self._ensure_loaded()
+        with self._lock:
+            mine = self._row_ids(user_id)
+            return {
+                int(o): int(np.isin(self._row_ids(o), mine, assume_unique=True).sum())
+                for o in others
+            }
+
+    def friends_of_friends(self, user_id: int, limit: int = 20) -> List[Tuple[int, int]]:
+        """Non-friends reachable in two hops, ranked by mutual-friend count.
+
+        Returns `(candidate_id, mutual_count)` pairs, ties broken by id.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            mine = self._row_ids(user_id)
+            if not len(mine):
+                return []
+            reached = np.concatenate([self._row_ids(f) for f in mine.tolist()])
+        candidates, counts = np.unique(reached, return_counts=True)
+        keep = (candidates != user_id) & ~np.isin(candidates, mine, assume_unique=True)
+        candidates, counts = candidates[keep], counts[keep]
+        order = np.lexsort((candidates, -counts))[:limit]
+        return list(zip(candidates[order].tolist(), counts[order].tolist()))
+
+
+friend_graph = FriendGraph()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from social.models import Activity, Favorite, Like, Review
+
+
+class Command(BaseCommand):
+    """Populate the `Activity` stream from existing favorites, likes and reviews."""
+
+    help = "Backfill Activity rows for existing Favorite, Like and Review rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        sources = (
+            (Activity.VERB_FAVORITE, Favorite),
+            (Activity.VERB_LIKE, Like),
+            (Activity.VERB_REVIEW, Review),
+        )
+        total = 0
+        for verb, model in sources:
+            last_pk = 0
+            while True:
+                rows = list(
+                    model.objects.filter(pk__gt=last_pk)
+                    .order_by("pk")
+                    .values_list("pk", "user_id", "movie_id", "created_at")[:batch_size]
+                )
+                if not rows:
+                    break
+                Activity.objects.bulk_create(
+                    [
+                        Activity(
+                            user_id=user_id,
+                            movie_id=movie_id,
+                            verb=verb,
+                            object_id=pk,
+                            review_id=pk if verb == Activity.VERB_REVIEW else None,
+                            created_at=created_at,
+                        )
+                        for pk, user_id, movie_id, created_at in rows
+                    ],
+                    ignore_conflicts=True,
+                )
+                last_pk = rows[-1][0]
+                total += len(rows)
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {total} activity rows."))
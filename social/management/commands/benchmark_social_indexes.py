@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from movies.models import Movie
+from social.models import Favorite, Like, Review, Share
+
+INDEXED_MODELS = (Favorite, Like, Review, Share)
+# Only the composite indexes under test are dropped; feed, activity and
+# status indexes declared on the same models are left alone
+BENCHMARKED_INDEXES = frozenset({
+    "favorite_user_recent_idx",
+    "favorite_movie_recent_idx",
+    "like_user_recent_idx",
+    "like_movie_recent_idx",
+    "like_created_idx",
+    "review_user_recent_idx",
+    "share_user_recent_idx",
+    "share_movie_recent_idx",
+    "share_created_idx",
+})
+BENCH_PREFIX = "bench_"
+
+
+class Command(BaseCommand):
+    """Compare query plans for the hot social filters with and without indexes.
+
+    Meant for a scratch database and refuses to run without `--scratch-db`:
+    `--seed` inserts synthetic users, movies and `--rows` engagement rows
+    per table. The indexes in BENCHMARKED_INDEXES are dropped for the
+    "before" run and always recreated afterwards, even if a query fails.
+    """
+
+    help = "Seed synthetic social data and EXPLAIN hot queries before/after indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scratch-db",
+            action="store_true",
+            help="Confirm the configured database is disposable; indexes are dropped.",
+        )
+        parser.add_argument("--seed", action="store_true", help="Insert synthetic rows first.")
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--users", type=int, default=20_000)
+        parser.add_argument("--movies", type=int, default=5_000)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        if not options["scratch_db"]:
+            raise CommandError(
+                "This command drops indexes and inserts rows; "
+                "run it against a scratch database with --scratch-db."
+            )
+        if options["seed"]:
+            self._seed(options)
+        user_ids = list(
+            get_user_model().objects.filter(username__startswith=BENCH_PREFIX)
+            .values_list("id", flat=True)[:200]
+        )
+        if not user_ids:
+            raise CommandError("No benchmark users found; run with --seed first.")
+        queries = self._queries(user_ids)
+
+        try:
+            self._set_indexes(drop=True)
+            self.stdout.write(self.style.MIGRATE_HEADING("== before (without composite indexes) =="))
+            self._explain(queries, options["repeat"])
+        finally:
+            self._set_indexes(drop=False)
+        self.stdout.write(self.style.MIGRATE_HEADING("== after (composite indexes) =="))
+        self._explain(queries, options["repeat"])
+
+    def _queries(self, user_ids):
+        now = timezone.now()
+        day_ago = now - timedelta(days=1)
+        week_ago = now - timedelta(days=7)
+        return {
+            "friends_activity: favorites by friends in last 24h": (
+                Favorite.objects.filter(user_id__in=user_ids[:100], created_at__gte=day_ago)
+                .order_by("-created_at")[:100]
+            ),
+            "user_movie_history: recent likes for one user": (
+                Like.objects.filter(user_id=user_ids[0]).order_by("-created_at")[:20]
+            ),
+            "active_users: reviews in last 7 days": (
+                Review.objects.filter(created_at__gte=week_ago)
+                .values("user_id")
+                .distinct()
+            ),
+            "movie activity: recent shares for one movie": (
+                Share.objects.filter(movie_id=Movie.objects.values_list("id", flat=True).first())
+                .order_by("-created_at")[:20]
+            ),
+        }
+
+    def _explain(self, queries, repeat):
+        for label, qs in queries.items():
+            timings = []
+            for _ in range(max(1, repeat)):
+                started = time.perf_counter()
+                list(qs.all())
+                timings.append((time.perf_counter() - started) * 1000.0)
+            self.stdout.write(f"\n-- {label}: best {min(timings):.2f} ms over {len(timings)} runs")
+            self.stdout.write(qs.explain())
+
+    def _set_indexes(self, drop: bool):
+        with connection.schema_editor() as editor:
+            for model in INDEXED_MODELS:
+                with connection.cursor() as cursor:
+                    existing = set(
+                        connection.introspection.get_constraints(cursor, model._meta.db_table)
+                    )
+                for index in model._meta.indexes:
+                    if index.name not in BENCHMARKED_INDEXES:
+                        continue
+                    if drop and index.name in existing:
+                        editor.remove_index(model, index)
+                    elif not drop and index.name not in existing:
+                        editor.add_index(model, index)
+
+    def _seed(self, options):
+        User = get_user_model()
+        n_rows = options["rows"]
+        batch = max(1, options["batch_size"])
+        self.stdout.write(f"Seeding {options['users']} users, {options['movies']} movies ...")
+        User.objects.bulk_create(
+            [User(username=f"{BENCH_PREFIX}{i}") for i in range(options["users"])],
+            batch_size=batch,
+            ignore_conflicts=True,
+        )
+        Movie.objects.bulk_create(
+            [Movie(imdb_id=f"{BENCH_PREFIX}{i}", title=f"Bench {i}") for i in range(options["movies"])],
+            batch_size=batch,
+            ignore_conflicts=True,
+        )
+        user_ids = list(User.objects.filter(username__startswith=BENCH_PREFIX).values_list("id", flat=True))
+        movie_ids = list(Movie.objects.filter(imdb_id__startswith=BENCH_PREFIX).values_list("id", flat=True))
+        now = timezone.now()
+        rng = random.Random(42)
+
+        for model in INDEXED_MODELS:
+            self.stdout.write(f"Seeding {n_rows} {model.__name__} rows ...")
+            seeded_from = timezone.now()
+            created = 0
+            while created < n_rows:
+                size = min(batch, n_rows - created)
+                objs = []
+                for _ in range(size):
+                    kwargs = {"user_id": rng.choice(user_ids), "movie_id": rng.choice(movie_ids)}
+                    if model is Review:
+                        kwargs["content"] = "bench"
+                    objs.append(model(**kwargs))
+                model.objects.bulk_create(objs, ignore_conflicts=True)
+                created += size
+            # auto_now_add stamps every row with "now"; spread them over 90 days
+            with connection.cursor() as cursor:
+                table = connection.ops.quote_name(model._meta.db_table)
+                ids = list(
+                    model.objects.filter(created_at__gte=seeded_from).values_list("id", flat=True)
+                )
+                for i in range(0, len(ids), batch):
+                    chunk = ids[i:i + batch]
+                    cursor.executemany(
+                        f"UPDATE {table} SET created_at = %s WHERE id = %s",
+                        [(now - timedelta(seconds=rng.randint(0, 90 * 86400)), pk) for pk in chunk],
+                    )
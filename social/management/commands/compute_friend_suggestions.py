@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from social.recommendations import compute_friend_suggestions
+
+
+class Command(BaseCommand):
+    """Recompute genre-similarity friend suggestions for every user."""
+
+    help = "Compute top-K friend suggestions from Favorite/Like genre affinity."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=10)
+        parser.add_argument("--pool", type=int, default=50_000, help="Candidate pool size.")
+        parser.add_argument("--chunk-size", type=int, default=1024)
+        parser.add_argument("--min-score", type=float, default=0.1)
+        parser.add_argument("--user", type=int, action="append", dest="user_ids")
+
+    def handle(self, *args, **options):
+        written = compute_friend_suggestions(
+            user_ids=options["user_ids"],
+            top_k=options["top_k"],
+            candidate_pool=options["pool"],
+            chunk_size=options["chunk_size"],
+            min_score=options["min_score"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} friend suggestions."))
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from social.sentiment import analyze_reviews, requeue_stalled
+
+
+class Command(BaseCommand):
+    """Re-run sentiment for reviews whose background job never finished.
+
+    Picks up pending and failed reviews older than `--older-than` minutes,
+    plus processing reviews whose claim is that old (e.g. jobs lost to a
+    restart), and analyzes them in multi-review batches.
+    """
+
+    help = "Analyze stalled pending/failed review sentiment."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than", type=int, default=10, help="Minutes.")
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "REVIEW_SENTIMENT_BATCH_SIZE", 20),
+        )
+
+    def handle(self, *args, **options):
+        review_ids = requeue_stalled(options["older_than"])
+        size = max(1, options["batch_size"])
+        batches = [review_ids[i:i + size] for i in range(0, len(review_ids), size)]
+
+        def run(batch):
+            try:
+                return analyze_reviews(batch, batch_size=size)
+            finally:
+                close_old_connections()
+
+        with ThreadPoolExecutor(max_workers=max(1, options["workers"])) as pool:
+            done = sum(pool.map(run, batches))
+        self.stdout.write(self.style.SUCCESS(f"Analyzed {done} of {len(review_ids)} reviews."))
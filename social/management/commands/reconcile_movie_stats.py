@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from movies.models import Movie
+from social.models import Favorite, Like, MovieStats, Review, Share
+
+
+class Command(BaseCommand):
+    """Recompute `MovieStats` counters from the social source tables."""
+
+    help = "Reconcile denormalized per-movie engagement counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        sources = {
+            "likes": Like,
+            "favorites": Favorite,
+            "reviews": Review,
+            "shares": Share,
+        }
+        last_pk = 0
+        total = 0
+        while True:
+            ids = list(
+                Movie.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            counts = {name: {} for name in sources}
+            for name, model in sources.items():
+                counts[name] = dict(
+                    model.objects.filter(movie_id__in=ids)
+                    .order_by()
+                    .values("movie_id")
+                    .annotate(n=Count("id"))
+                    .values_list("movie_id", "n")
+                )
+            MovieStats.objects.bulk_create(
+                [
+                    MovieStats(
+                        movie_id=movie_id,
+                        **{name: counts[name].get(movie_id, 0) for name in sources},
+                    )
+                    for movie_id in ids
+                ],
+                update_conflicts=True,
+                unique_fields=["movie"],
+                update_fields=list(sources),
+            )
+            last_pk = ids[-1]
+            total += len(ids)
+        self.stdout.write(self.style.SUCCESS(f"Reconciled stats for {total} movies."))
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from social.services import refresh_popularity
+
+
+class Command(BaseCommand):
+    """Fold new engagement events into the decayed popularity scores."""
+
+    help = "Incrementally refresh time-decayed movie popularity scores."
+
+    def handle(self, *args, **options):
+        touched = refresh_popularity()
+        self.stdout.write(self.style.SUCCESS(f"Updated popularity for {touched} movies."))
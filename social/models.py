@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 from movies.models import Movie
 
@@ -15,6 +16,11 @@ class Favorite(models.Model):
 
     class Meta:
         unique_together = ("user", "movie")
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="favorite_feed_idx"),
+            models.Index(fields=["user", "-created_at"], name="favorite_user_recent_idx"),
+            models.Index(fields=["movie", "-created_at"], name="favorite_movie_recent_idx"),
+        ]
 
 
 class Like(models.Model):
@@ -26,6 +32,11 @@ class Like(models.Model):
 
     class Meta:
         unique_together = ("user", "movie")
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="like_user_recent_idx"),
+            models.Index(fields=["movie", "-created_at"], name="like_movie_recent_idx"),
+            models.Index(fields=["created_at"], name="like_created_idx"),
+        ]
 
 
 class Review(models.Model):
@@ -35,6 +46,7 @@ class Review(models.Model):
     - sentiment_confidence: Optional confidence score (0..1)
     - emotions: JSON mapping of emotions to scores
     - sentiment_breakdown: JSON with pros/cons/themes
+    - sentiment_status: pending until the background analysis has run
     """
 
     SENTIMENT_CHOICES = (
@@ -42,6 +54,16 @@ class Review(models.Model):
         ("neutral", "Neutral"),
         ("negative", "Negative"),
     )
+    SENTIMENT_PENDING = "pending"
+    SENTIMENT_PROCESSING = "processing"
+    SENTIMENT_DONE = "done"
+    SENTIMENT_FAILED = "failed"
+    SENTIMENT_STATUS_CHOICES = (
+        (SENTIMENT_PENDING, "Pending"),
+        (SENTIMENT_PROCESSING, "Processing"),
+        (SENTIMENT_DONE, "Done"),
+        (SENTIMENT_FAILED, "Failed"),
+    )
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="reviews")
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="reviews")
@@ -51,10 +73,26 @@ class Review(models.Model):
     sentiment_confidence = models.FloatField(null=True, blank=True)
     emotions = models.JSONField(default=dict, blank=True)
     sentiment_breakdown = models.JSONField(default=dict, blank=True)
+    # Set to pending on create; the background sentiment worker fills in the
+    # fields above and moves it to done/failed
+    sentiment_status = models.CharField(
+        max_length=10, choices=SENTIMENT_STATUS_CHOICES, default=SENTIMENT_DONE
+    )
+    # When a worker moved the review to processing; the recovery sweep only
+    # requeues claims older than its cutoff
+    sentiment_claimed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            # keyset pagination of the review feed, global and per movie
+            models.Index(fields=["-created_at", "-id"], name="review_feed_idx"),
+            models.Index(fields=["movie", "-created_at", "-id"], name="review_movie_feed_idx"),
+            models.Index(fields=["user", "-created_at"], name="review_user_recent_idx"),
+            # sweep for reviews whose background sentiment never finished
+            models.Index(fields=["sentiment_status", "created_at"], name="review_sentiment_status_idx"),
+        ]
 
 
 class Share(models.Model):
@@ -65,6 +103,102 @@ class Share(models.Model):
     platform = models.CharField(max_length=50, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="share_user_recent_idx"),
+            models.Index(fields=["movie", "-created_at"], name="share_movie_recent_idx"),
+            models.Index(fields=["created_at"], name="share_created_idx"),
+        ]
+
+
+class MovieStats(models.Model):
+    """Denormalized engagement counters for a movie.
+
+    Maintained with F() increments by the social create/delete paths
+    (see `social.services.bump_movie_stats`); `reconcile_movie_stats`
+    recomputes them from the source tables.
+    """
+
+    movie = models.OneToOneField(
+        Movie,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    likes = models.PositiveIntegerField(default=0)
+    favorites = models.PositiveIntegerField(default=0)
+    reviews = models.PositiveIntegerField(default=0)
+    shares = models.PositiveIntegerField(default=0)
+    # Exponentially time-decayed engagement score, stored relative to
+    # `PopularityCheckpoint.epoch` so only movies with new events change
+    # (see `social.services.refresh_popularity`).
+    popularity = models.FloatField(default=0.0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-popularity"], name="moviestats_popularity_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"stats({self.movie_id})"
+
+
+class PopularityCheckpoint(models.Model):
+    """Singleton watermark for incremental popularity refreshes.
+
+    Events created up to `computed_at` are folded into the scores; the next
+    run only scans events created after it. `epoch` is the reference time
+    the stored scores are scaled to.
+    """
+
+    computed_at = models.DateTimeField(null=True, blank=True)
+    epoch = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"popularity@{self.computed_at}"
+
+
+class Activity(models.Model):
+    """Unified engagement stream (favorites, likes, reviews) keyed by actor.
+
+    One row is written alongside each source row so friends' activity is a
+    single `(user IN friends, created_at DESC)` index range scan.
+    `object_id` is the source row's pk; `review` is set for review entries
+    so feeds can render them without another lookup.
+    """
+
+    VERB_FAVORITE = "favorite"
+    VERB_LIKE = "like"
+    VERB_REVIEW = "review"
+    VERB_CHOICES = (
+        (VERB_FAVORITE, "Favorite"),
+        (VERB_LIKE, "Like"),
+        (VERB_REVIEW, "Review"),
+    )
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="activities")
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="activities")
+    verb = models.CharField(max_length=10, choices=VERB_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    review = models.ForeignKey(
+        Review,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ("-created_at",)
+        unique_together = ("verb", "object_id")
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"], name="activity_user_feed_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.user_id} {self.verb} {self.movie_id}"
+
 
 class Friendship(models.Model):
     """Represents a friendship between two users.
@@ -122,6 +256,14 @@ class FriendRequest(models.Model):
     class Meta:
         unique_together = ("from_user", "to_user")
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["to_user", "status", "-created_at"], name="friendreq_inbox_idx"
+            ),
+            models.Index(
+                fields=["from_user", "status", "-created_at"], name="friendreq_outbox_idx"
+            ),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.from_user} -> {self.to_user} ({self.status})"
@@ -0,0 +1,268 @@
+"""
+Friend recommendation engine based on genre-taste similarity.
+
+Builds a sparse user x genre affinity matrix from Favorite and Like rows,
+compares users by cosine similarity with chunked matrix products and stores
+the top-K neighbours per user as `FriendSuggestion` rows.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import close_old_connections
+from django.db.models import Count
+
+from movies.models import Genre
+from .models import Favorite, FriendSuggestion, Friendship, Like
+
+try:
+    import numpy as np  # type: ignore
+    from scipy import sparse  # type: ignore
+except Exception:  # pragma: no cover - optional dependency at runtime
+    np = None  # type: ignore
+    sparse = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of each engagement type in a user's genre affinity
+AFFINITY_WEIGHTS = ((Favorite, 2.0), (Like, 1.0))
+SHARED_GENRES_MAX = 3
+# Queued (API-triggered) runs reuse the affinity matrix for this long
+AFFINITY_MAX_AGE = 15 * 60
+
+
+class AffinityMatrix:
+    """Row-normalized user x genre matrix plus the id lookups for its axes."""
+
+    def __init__(self, matrix, user_ids, genre_names: List[str], engagement):
+        self.matrix = matrix
+        self.user_ids = user_ids
+        self.genre_names = genre_names
+        self.engagement = engagement
+        self._pools: Dict[int, Tuple["np.ndarray", "np.ndarray"]] = {}
+
+    def pool(self, size: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Ids and dense rows of the `size` most engaged users (memoized)."""
+        if size not in self._pools:
+            rows = np.argsort(-self.engagement, kind="stable")[:size]
+            self._pools[size] = (self.user_ids[rows], self.matrix[rows].toarray())
+        return self._pools[size]
+
+
+def build_affinity_matrix() -> Optional[AffinityMatrix]:
+    """Aggregate (user, genre) engagement in SQL and load it as a CSR matrix."""
+    users: List[int] = []
+    genres: List[int] = []
+    weights: List[float] = []
+    for model, weight in AFFINITY_WEIGHTS:
+        qs = (
+            model.objects.filter(movie__genres__isnull=False)
+            .order_by()
+            .values("user_id", "movie__genres")
+            .annotate(n=Count("id"))
+            .values_list("user_id", "movie__genres", "n")
+        )
+        for user_id, genre_id, n in qs.iterator(chunk_size=10000):
+            users.append(user_id)
+            genres.append(genre_id)
+            weights.append(weight * n)
+    if not users:
+        return None
+
+    user_ids, user_idx = np.unique(np.asarray(users, dtype=np.int64), return_inverse=True)
+    genre_ids, genre_idx = np.unique(np.asarray(genres, dtype=np.int64), return_inverse=True)
+    raw = sparse.coo_matrix(
+        (np.asarray(weights, dtype=np.float32), (user_idx, genre_idx)),
+        shape=(len(user_ids), len(genre_ids)),
+    ).tocsr()
+    norms = np.sqrt(np.asarray(raw.multiply(raw).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    matrix = (sparse.diags(1.0 / norms) @ raw).astype(np.float32).tocsr()
+    names_by_id = dict(Genre.objects.filter(id__in=genre_ids.tolist()).values_list("id", "name"))
+    genre_names = [names_by_id.get(int(g), "") for g in genre_ids]
+    engagement = np.asarray(raw.sum(axis=1)).ravel()
+    return AffinityMatrix(matrix, user_ids, genre_names, engagement)
+
+
+_affinity_lock = threading.Lock()
+_affinity_cache: Optional[Tuple[float, Optional[AffinityMatrix]]] = None
+
+
+def get_affinity_matrix(max_age: float = AFFINITY_MAX_AGE) -> Optional[AffinityMatrix]:
+    """Process-wide affinity matrix, rebuilt once older than max_age seconds.
+
+    Concurrent callers wait for a single rebuild instead of each scanning
+    the Favorite and Like tables.
+    """
+    global _affinity_cache
+    with _affinity_lock:
+        if _affinity_cache is not None and time.monotonic() - _affinity_cache[0] < max_age:
+            return _affinity_cache[1]
+        affinity = build_affinity_matrix()
+        _affinity_cache = (time.monotonic(), affinity)
+        return affinity
+
+
+def _friend_keys(user_ids) -> "np.ndarray":
+    pairs = list(
+        Friendship.objects.filter(user_id__in=[int(u) for u in user_ids])
+        .values_list("user_id", "friend_id")
+    )
+    if not pairs:
+        return np.empty(0, dtype=np.int64)
+    arr = np.asarray(pairs, dtype=np.int64)
+    return np.sort((arr[:, 0] << 32) | arr[:, 1])
+
+
+def compute_friend_suggestions(
+    user_ids: Optional[Iterable[int]] = None,
+    top_k: int = 10,
+    candidate_pool: int = 50_000,
+    chunk_size: int = 1024,
+    min_score: float = 0.1,
+    affinity_max_age: float = 0.0,
+) -> int:
+    """Compute and upsert top-K friend suggestions; returns rows written.
+
+    Each target user is compared against the `candidate_pool` most engaged
+    users with one dense (chunk x genres) @ (genres x pool) product per
+    chunk, so memory stays at chunk_size x candidate_pool floats. Self and
+    existing friends are excluded. Existing suggestions keep their status;
+    only the score and shared genres are refreshed. With `affinity_max_age`
+    the cached matrix (see `get_affinity_matrix`) is reused if fresh enough.
+    """
+    if np is None or sparse is None:
+        raise RuntimeError("numpy and scipy are required for friend recommendations")
+    affinity = get_affinity_matrix(affinity_max_age)
+    if affinity is None:
+        return 0
+
+    matrix, all_ids = affinity.matrix, affinity.user_ids
+    pool_ids, pool = affinity.pool(candidate_pool)
+
+    if user_ids is None:
+        target_rows = np.arange(len(all_ids))
+    else:
+        wanted = np.asarray(sorted(set(int(u) for u in user_ids)), dtype=np.int64)
+        target_rows = np.nonzero(np.isin(all_ids, wanted))[0]
+
+    # Over-fetch so excluding friends still leaves top_k candidates
+    fetch = min(len(pool_ids), top_k + 32)
+    written = 0
+    for start in range(0, len(target_rows), chunk_size):
+        rows = target_rows[start:start + chunk_size]
+        chunk_ids = all_ids[rows]
+        dense = matrix[rows].toarray()
+        scores = dense @ pool.T
+        scores[chunk_ids[:, None] == pool_ids[None, :]] = -1.0
+
+        if fetch < scores.shape[1]:
+            cand = np.argpartition(-scores, fetch - 1, axis=1)[:, :fetch]
+        else:
+            cand = np.tile(np.arange(scores.shape[1]), (len(rows), 1))
+        cand_scores = np.take_along_axis(scores, cand, axis=1)
+        order = np.argsort(-cand_scores, axis=1, kind="stable")
+        cand = np.take_along_axis(cand, order, axis=1)
+        cand_scores = np.take_along_axis(cand_scores, order, axis=1)
+
+        friends = _friend_keys(chunk_ids)
+        keys = (chunk_ids[:, None] << 32) | pool_ids[cand]
+        excluded = np.isin(keys, friends) | (cand_scores < min_score)
+        cand_scores = np.where(excluded, -np.inf, cand_scores)
+        order = np.argsort(-cand_scores, axis=1, kind="stable")[:, :top_k]
+        cand = np.take_along_axis(cand, order, axis=1)
+        cand_scores = np.take_along_axis(cand_scores, order, axis=1)
+
+        overlap = dense[:, None, :] * pool[cand]
+        top_genres = np.argsort(-overlap, axis=2)[:, :, :SHARED_GENRES_MAX]
+
+        objs = []
+        for i, user_id in enumerate(chunk_ids.tolist()):
+            for j in range(cand.shape[1]):
+                score = float(cand_scores[i, j])
+                if not np.isfinite(score):
+                    continue
+                shared = [
+                    affinity.genre_names[g]
+                    for g in top_genres[i, j].tolist()
+                    if overlap[i, j, g] > 0
+                ]
+                objs.append(
+                    FriendSuggestion(
+                        user_id=user_id,
+                        suggested_user_id=int(pool_ids[cand[i, j]]),
+                        similarity_score=round(score, 4),
+                        shared_genres=shared,
+                    )
+                )
+        if objs:
+            FriendSuggestion.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=["user", "suggested_user_id"],
+                update_fields=["similarity_score", "shared_genres"],
+            )
+        written += len(objs)
+        logger.debug(
+            "friend_reco: chunk=%s users=%s written=%s", start, len(rows), len(objs)
+        )
+    return written
+
+
+class SuggestionRunner:
+    """Single background thread that runs queued suggestion recomputes.
+
+    Requests made while a run is in progress are merged into the next run,
+    so bursts of API calls cost at most one extra pass; the largest
+    requested top_k wins.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pending: Set[int] = set()
+        self._all = False
+        self._top_k = 0
+
+    def submit(self, user_ids: Optional[Iterable[int]] = None, top_k: int = 10) -> None:
+        """Queue the given users, or everyone when user_ids is None."""
+        with self._lock:
+            if user_ids is None:
+                self._all = True
+            else:
+                self._pending.update(int(u) for u in user_ids)
+            self._top_k = max(self._top_k, top_k)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._drain, name="friend-suggestions", daemon=True
+                )
+                self._thread.start()
+
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                if not self._all and not self._pending:
+                    self._thread = None
+                    return
+                user_ids = None if self._all else sorted(self._pending)
+                top_k = self._top_k
+                self._all, self._pending, self._top_k = False, set(), 0
+            try:
+                written = compute_friend_suggestions(
+                    user_ids=user_ids, top_k=top_k, affinity_max_age=AFFINITY_MAX_AGE
+                )
+                logger.info(
+                    "friend_suggestions: run users=%s wrote=%s",
+                    "all" if user_ids is None else len(user_ids),
+                    written,
+                )
+            except Exception:
+                logger.exception("friend_suggestions: run failed")
+            finally:
+                close_old_connections()
+
+
+suggestion_runner = SuggestionRunner()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import List
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from notifications.services import gemini_advanced_sentiment_batch
+from .models import Review
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentWorker:
+    """Background pool that fills in review sentiment after the review commits.
+
+    `ReviewSerializer.create` saves reviews as `pending` and schedules them
+    here on commit, so no DB transaction is held across the LLM round trip.
+    A dispatcher thread drains the queue into batches of up to
+    REVIEW_SENTIMENT_BATCH_SIZE reviews, and each batch is analyzed with one
+    multi-review prompt on a pool of REVIEW_SENTIMENT_WORKERS threads.
+    """
+
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[int]" = queue.Queue()
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return max(1, int(getattr(settings, "REVIEW_SENTIMENT_WORKERS", 4)))
+
+    @property
+    def batch_size(self) -> int:
+        return max(1, int(getattr(settings, "REVIEW_SENTIMENT_BATCH_SIZE", 20)))
+
+    def submit(self, review_id: int) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="review-sentiment"
+                )
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._dispatch, name="review-sentiment-dispatch", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(review_id)
+
+    def submit_on_commit(self, review_id: int) -> None:
+        """Schedule analysis once the surrounding transaction commits."""
+        transaction.on_commit(lambda: self.submit(review_id))
+
+    def _next_batch(self) -> List[int]:
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get(timeout=0.5))
+            except queue.Empty:
+                break
+        return batch
+
+    def _dispatch(self) -> None:
+        while True:
+            batch = self._next_batch()
+            self._executor.submit(self._run, batch)
+
+    def _run(self, review_ids: List[int]) -> None:
+        try:
+            analyze_reviews(review_ids, batch_size=self.batch_size)
+        except Exception:
+            logger.exception("review_sentiment: batch failed ids=%s", review_ids)
+        finally:
+            close_old_connections()
+
+
+def _claim(review_ids: List[int]) -> List[int]:
+    """Move pending reviews to processing; returns the ids this caller owns.
+
+    Rows locked by another worker are skipped, so a review is analyzed once
+    even when several processes or the recovery sweep schedule it.
+    """
+    with transaction.atomic():
+        claimed = list(
+            Review.objects.filter(
+                id__in=review_ids, sentiment_status=Review.SENTIMENT_PENDING
+            )
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)
+        )
+        if claimed:
+            Review.objects.filter(id__in=claimed).update(
+                sentiment_status=Review.SENTIMENT_PROCESSING,
+                sentiment_claimed_at=timezone.now(),
+            )
+    return claimed
+
+
+def analyze_reviews(review_ids: List[int], batch_size: int = 20) -> int:
+    """Claim pending reviews, run batched sentiment and store the results.
+
+    Returns the number of reviews analyzed.
+    """
+    claimed = _claim(list(review_ids))
+    if not claimed:
+        return 0
+    try:
+        texts = dict(Review.objects.filter(id__in=claimed).values_list("id", "content"))
+        results = gemini_advanced_sentiment_batch(
+            {str(pk): text for pk, text in texts.items()}, batch_size=batch_size
+        )
+        rows = list(Review.objects.filter(id__in=list(texts)).only("id"))
+        for review in rows:
+            result = results[str(review.id)]
+            review.sentiment = result["overall"]
+            review.sentiment_confidence = result["confidence"]
+            review.emotions = result["emotions"]
+            review.sentiment_breakdown = result["breakdown"]
+            review.sentiment_status = Review.SENTIMENT_DONE
+        Review.objects.bulk_update(
+            rows,
+            [
+                "sentiment",
+                "sentiment_confidence",
+                "emotions",
+                "sentiment_breakdown",
+                "sentiment_status",
+            ],
+        )
+    except Exception:
+        # never leave claimed rows in processing: analysis and write errors
+        # (e.g. a DataError on an unexpected value) mark them failed
+        Review.objects.filter(id__in=claimed).update(sentiment_status=Review.SENTIMENT_FAILED)
+        raise
+    logger.debug(
+        "review_sentiment: requested=%s analyzed=%s", len(review_ids), len(rows)
+    )
+    return len(rows)
+
+
+def requeue_stalled(older_than_minutes: int = 10) -> List[int]:
+    """Reset stuck processing/failed reviews to pending; returns their ids.
+
+    Covers jobs lost to a process restart before they finished. Processing
+    reviews are requeued only once their claim (`sentiment_claimed_at`) is
+    older than the cutoff, so work still in flight is not analyzed twice;
+    pending ones older than the cutoff are returned as-is, and `_claim`
+    skips any that a worker picks up first.
+    """
+    cutoff = timezone.now() - timedelta(minutes=older_than_minutes)
+    lost_claim = Q(sentiment_status=Review.SENTIMENT_PROCESSING) & (
+        Q(sentiment_claimed_at__lt=cutoff) | Q(sentiment_claimed_at__isnull=True)
+    )
+    stalled = list(
+        Review.objects.filter(
+            Q(
+                sentiment_status__in=[Review.SENTIMENT_PENDING, Review.SENTIMENT_FAILED],
+                created_at__lt=cutoff,
+            )
+            | lost_claim
+        ).values_list("id", flat=True)
+    )
+    if stalled:
+        Review.objects.filter(
+            Q(sentiment_status=Review.SENTIMENT_FAILED) | lost_claim, id__in=stalled
+        ).update(sentiment_status=Review.SENTIMENT_PENDING, sentiment_claimed_at=None)
+    return stalled
+
+
+sentiment_worker = SentimentWorker()
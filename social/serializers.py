@@ -5,10 +5,10 @@ from typing import Any
 from django.db import transaction
 from rest_framework import serializers
 
-from movies.models import Movie
 from movies.serializers import MovieSerializer
-from movies.services import get_movie_details, map_omdb_to_fields
+from movies.services import get_or_fetch_movie
 from .models import (
+    Activity,
     Favorite,
     Like,
     Review,
@@ -20,6 +20,7 @@ from .models import (
     MovieNightVote,
     FriendSuggestion,
 )
+from .services import bump_movie_stats, record_activity, remove_activity
 from users.serializers import UserSerializer
 
 
@@ -35,12 +36,14 @@ class FavoriteSerializer(serializers.ModelSerializer):
     def create(self, validated_data: dict[str, Any]):
         user = self.context["request"].user
         imdb_id = validated_data.pop("imdb_id")
-        movie = Movie.objects.filter(imdb_id=imdb_id).first()
+        movie = get_or_fetch_movie(imdb_id)
         if not movie:
-            payload = get_movie_details(imdb_id)
-            fields = map_omdb_to_fields(payload)
-            movie = Movie.objects.create(**fields)
-        obj, _ = Favorite.objects.get_or_create(user=user, movie=movie)
+            raise serializers.ValidationError({"imdb_id": "Movie not found."})
+        with transaction.atomic():
+            obj, created = Favorite.objects.get_or_create(user=user, movie=movie)
+            if created:
+                bump_movie_stats(movie.id, favorites=1)
+                record_activity(Activity.VERB_FAVORITE, obj)
         return obj
 
 
@@ -68,15 +71,20 @@ class LikeToggleSerializer(serializers.Serializer):
     def save(self, **kwargs):
         user = self.context["request"].user
         imdb_id = self.validated_data["imdb_id"]
-        movie = Movie.objects.filter(imdb_id=imdb_id).first()
+        movie = get_or_fetch_movie(imdb_id)
         if not movie:
-            payload = get_movie_details(imdb_id)
-            fields = map_omdb_to_fields(payload)
-            movie = Movie.objects.create(**fields)
-        like, created = Like.objects.get_or_create(user=user, movie=movie)
-        if not created:
-            like.delete()
-            return {"liked": False}
+            raise serializers.ValidationError({"imdb_id": "Movie not found."})
+        with transaction.atomic():
+            like, created = Like.objects.get_or_create(user=user, movie=movie)
+            if not created:
+                # a concurrent unlike may have deleted the row already
+                deleted, _ = Like.objects.filter(pk=like.pk).delete()
+                if deleted:
+                    bump_movie_stats(movie.id, likes=-1)
+                    remove_activity(Activity.VERB_LIKE, like.pk)
+                return {"liked": False}
+            bump_movie_stats(movie.id, likes=1)
+            record_activity(Activity.VERB_LIKE, like)
         return {"liked": True}
 
 
@@ -116,6 +124,7 @@ class ReviewSerializer(serializers.ModelSerializer):
             "sentiment_confidence",
             "emotions",
             "sentiment_breakdown",
+            "sentiment_status",
             "created_at",
         ]
         read_only_fields = [
@@ -125,32 +134,29 @@ class ReviewSerializer(serializers.ModelSerializer):
             "sentiment_confidence",
             "emotions",
             "sentiment_breakdown",
+            "sentiment_status",
             "created_at",
         ]
 
     def create(self, validated_data):
-        from notifications.services import gemini_analyze_sentiment, gemini_advanced_sentiment
+        from .sentiment import sentiment_worker
 
         user = self.context["request"].user
         imdb_id = validated_data.pop("imdb_id")
-        content = validated_data.get("content", "")
+        movie = get_or_fetch_movie(imdb_id)
+        if not movie:
+            raise serializers.ValidationError({"imdb_id": "Movie not found."})
         with transaction.atomic():
-            movie = Movie.objects.filter(imdb_id=imdb_id).first()
-            if not movie:
-                payload = get_movie_details(imdb_id)
-                fields = map_omdb_to_fields(payload)
-                movie = Movie.objects.create(**fields)
-            adv = gemini_advanced_sentiment(content)
-            sentiment = (adv.get("overall") if isinstance(adv, dict) else None) or gemini_analyze_sentiment(content) or "neutral"
             review = Review.objects.create(
                 user=user,
                 movie=movie,
-                sentiment=sentiment,
-                sentiment_confidence=(adv.get("confidence") if isinstance(adv, dict) else None),
-                emotions=(adv.get("emotions") if isinstance(adv, dict) else {}),
-                sentiment_breakdown=(adv.get("breakdown") if isinstance(adv, dict) else {}),
+                sentiment_status=Review.SENTIMENT_PENDING,
                 **validated_data,
             )
+            bump_movie_stats(movie.id, reviews=1)
+            record_activity(Activity.VERB_REVIEW, review)
+            # sentiment runs in the background once the review is committed
+            sentiment_worker.submit_on_commit(review.id)
         return review
 
 
@@ -175,6 +181,29 @@ class ReviewActivitySerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class ReviewSnippetSerializer(serializers.ModelSerializer):
+    """Review fields embedded in activity stream entries."""
+
+    class Meta:
+        model = Review
+        fields = ["id", "content", "rating", "sentiment", "sentiment_confidence"]
+        read_only_fields = fields
+
+
+class ActivitySerializer(serializers.ModelSerializer):
+    """Activity stream entry with actor, movie and optional review."""
+
+    type = serializers.CharField(source="verb", read_only=True)
+    user = UserSerializer(read_only=True)
+    movie = MovieSerializer(read_only=True)
+    review = ReviewSnippetSerializer(read_only=True)
+
+    class Meta:
+        model = Activity
+        fields = ["id", "type", "user", "movie", "review", "created_at"]
+        read_only_fields = fields
+
+
 class ShareSerializer(serializers.ModelSerializer):
     imdb_id = serializers.CharField(write_only=True)
 
@@ -186,18 +215,20 @@ class ShareSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = self.context["request"].user
         imdb_id = validated_data.pop("imdb_id")
-        movie = Movie.objects.filter(imdb_id=imdb_id).first()
+        movie = get_or_fetch_movie(imdb_id)
         if not movie:
-            payload = get_movie_details(imdb_id)
-            fields = map_omdb_to_fields(payload)
-            movie = Movie.objects.create(**fields)
-        return Share.objects.create(user=user, movie=movie, **validated_data)
+            raise serializers.ValidationError({"imdb_id": "Movie not found."})
+        with transaction.atomic():
+            share = Share.objects.create(user=user, movie=movie, **validated_data)
+            bump_movie_stats(movie.id, shares=1)
+        return share
 
 
 class SocialStatsSerializer(serializers.Serializer):
     likes = serializers.IntegerField()
     favorites = serializers.IntegerField()
     reviews = serializers.IntegerField()
+    shares = serializers.IntegerField()
 
 
 class SocialPostGenerateSerializer(serializers.Serializer):
@@ -238,6 +269,28 @@ class TrendingUsersInputSerializer(serializers.Serializer):
         return out
 
 
+class FriendSuggestionItemSerializer(serializers.Serializer):
+    """One suggestion from the recommendation pipeline.
+
+    `user_id` is accepted as an alias for `suggested_user_id`.
+    """
+
+    suggested_user_id = serializers.IntegerField(required=False, min_value=1)
+    user_id = serializers.IntegerField(required=False, min_value=1)
+    similarity_score = serializers.FloatField(required=False, allow_null=True)
+    shared_genres = serializers.ListField(
+        child=serializers.CharField(), required=False, allow_null=True
+    )
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        suggested = attrs.pop("suggested_user_id", None) or attrs.pop("user_id", None)
+        attrs.pop("user_id", None)
+        if suggested is None:
+            raise serializers.ValidationError("suggested_user_id is required")
+        attrs["suggested_user_id"] = suggested
+        return attrs
+
+
 # --- Friend System Serializers ---
 
 
@@ -324,11 +377,9 @@ class MovieNightVoteSerializer(serializers.ModelSerializer):
         request = self.context["request"]
         movie_night: MovieNight = self.context["movie_night"]
         imdb_id = validated_data.pop("movie_imdb_id")
-        movie = Movie.objects.filter(imdb_id=imdb_id).first()
+        movie = get_or_fetch_movie(imdb_id)
         if not movie:
-            payload = get_movie_details(imdb_id)
-            fields = map_omdb_to_fields(payload)
-            movie = Movie.objects.create(**fields)
+            raise serializers.ValidationError({"movie_imdb_id": "Movie not found."})
         vote, _ = MovieNightVote.objects.get_or_create(
             movie_night=movie_night,
             user=request.user,
@@ -379,6 +430,56 @@ class MovieNightSerializer(serializers.ModelSerializer):
         return data
 
 
+class ParticipantAvatarSerializer(serializers.Serializer):
+    """Minimal user card for participant previews."""
+
+    id = serializers.IntegerField(source="user.id")
+    username = serializers.CharField(source="user.username")
+    display_name = serializers.CharField(source="user.display_name")
+    avatar_url = serializers.CharField(source="user.avatar_url")
+
+
+class MovieNightSummarySerializer(serializers.ModelSerializer):
+    """Compact movie night for list responses.
+
+    Expects the queryset annotations and `preview_participants` prefetch
+    applied by `MovieNightListCreateView`; the nested participant list is
+    only served by the detail view.
+    """
+
+    organizer = UserSerializer(read_only=True)
+    participant_counts = serializers.SerializerMethodField()
+    participant_preview = ParticipantAvatarSerializer(
+        source="preview_participants", many=True, read_only=True
+    )
+    my_status = serializers.CharField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = MovieNight
+        fields = [
+            "id",
+            "organizer",
+            "title",
+            "description",
+            "scheduled_date",
+            "location",
+            "status",
+            "max_participants",
+            "participant_counts",
+            "participant_preview",
+            "my_status",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_participant_counts(self, obj: MovieNight) -> dict[str, int]:
+        return {
+            status: getattr(obj, f"{status}_count", 0)
+            for status, _ in MovieNightParticipant.STATUS_CHOICES
+        }
+
+
 class FriendSuggestionSerializer(serializers.ModelSerializer):
     """Serializer for friend suggestions records."""
 
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import (
+    Activity,
+    Favorite,
+    FriendRequest,
+    FriendSuggestion,
+    Friendship,
+    Like,
+    MovieNightVote,
+    MovieStats,
+    PopularityCheckpoint,
+    Review,
+    Share,
+)
+from .graph import friend_graph
+
+logger = logging.getLogger(__name__)
+
+STATS_FIELDS = ("likes", "favorites", "reviews", "shares")
+SUGGESTION_FIELDS = ("similarity_score", "shared_genres")
+# Vote tallies are invalidated on every vote; the TTL only bounds staleness
+# for writes that bypass MovieNightVoteView (admin, cascades)
+TALLY_CACHE_TTL = 5 * 60
+
+# Per-event weights for the decayed popularity score
+POPULARITY_WEIGHTS = (
+    (Like, 1.0),
+    (Favorite, 2.0),
+    (Review, 3.0),
+    (Share, 2.0),
+)
+# Events are folded in only once they are this old, so rows whose
+# transaction commits after their created_at stamp are not skipped
+POPULARITY_COMMIT_LAG = timedelta(minutes=5)
+# Rescale stored scores to a newer epoch before 2**x approaches float range
+POPULARITY_REBASE_HALF_LIVES = 256
+
+
+def bump_movie_stats(movie_id: int, **deltas: int) -> None:
+    """Atomically adjust a movie's engagement counters, e.g. likes=1.
+
+    Uses a single UPDATE with F() expressions; the counter row is created
+    on first use. Counters never drop below zero.
+    """
+    updates = {
+        name: Greatest(F(name) + delta, 0)
+        for name, delta in deltas.items()
+        if name in STATS_FIELDS and delta
+    }
+    if not updates:
+        return
+    if MovieStats.objects.filter(movie_id=movie_id).update(**updates):
+        return
+    MovieStats.objects.bulk_create(
+        [MovieStats(movie_id=movie_id)], ignore_conflicts=True
+    )
+    MovieStats.objects.filter(movie_id=movie_id).update(**updates)
+
+
+def record_activity(verb: str, obj) -> Activity:
+    """Append a Favorite/Like/Review row to the activity stream."""
+    return Activity.objects.create(
+        user_id=obj.user_id,
+        movie_id=obj.movie_id,
+        verb=verb,
+        object_id=obj.pk,
+        review=obj if verb == Activity.VERB_REVIEW else None,
+        created_at=obj.created_at,
+    )
+
+
+def remove_activity(verb: str, object_id: int) -> None:
+    """Drop the stream entry for a deleted Favorite/Like/Review."""
+    Activity.objects.filter(verb=verb, object_id=object_id).delete()
+
+
+def _befriend(pairs: List[Tuple[int, int]]) -> None:
+    """Insert both Friendship edges for each (a, b) pair in one statement."""
+    Friendship.objects.bulk_create(
+        [
+            Friendship(user_id=u, friend_id=v)
+            for a, b in pairs
+            for u, v in ((a, b), (b, a))
+        ],
+        ignore_conflicts=True,
+    )
+
+    def _update_graph() -> None:
+        for a, b in pairs:
+            friend_graph.add_friendship(a, b)
+
+    transaction.on_commit(_update_graph)
+
+
+def accept_friend_request(friend_request: FriendRequest) -> bool:
+    """Accept one pending request; False if it was no longer pending.
+
+    A conditional UPDATE ... WHERE status='pending' decides the race between
+    concurrent accepts, and both friendship edges are inserted in the same
+    transaction, so a friendship is never half-created.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        accepted = FriendRequest.objects.filter(
+            pk=friend_request.pk, status=FriendRequest.STATUS_PENDING
+        ).update(status=FriendRequest.STATUS_ACCEPTED, updated_at=now)
+        if not accepted:
+            return False
+        _befriend([(friend_request.from_user_id, friend_request.to_user_id)])
+    friend_request.status = FriendRequest.STATUS_ACCEPTED
+    friend_request.updated_at = now
+    return True
+
+
+def accept_pending_friend_requests(
+    to_user_id: int, request_ids: Optional[Iterable[int]] = None
+) -> List[int]:
+    """Accept many pending requests addressed to to_user_id at once.
+
+    Locks the matching pending rows, flips them with one UPDATE and inserts
+    every friendship edge with one bulk insert. `request_ids=None` accepts
+    all pending requests. Returns the ids of the new friends.
+    """
+    with transaction.atomic():
+        pending = FriendRequest.objects.filter(
+            to_user_id=to_user_id, status=FriendRequest.STATUS_PENDING
+        ).order_by()
+        if request_ids is not None:
+            pending = pending.filter(id__in=list(request_ids))
+        rows = list(pending.select_for_update().values_list("id", "from_user_id"))
+        if not rows:
+            return []
+        FriendRequest.objects.filter(id__in=[pk for pk, _ in rows]).update(
+            status=FriendRequest.STATUS_ACCEPTED, updated_at=timezone.now()
+        )
+        _befriend([(from_id, to_user_id) for _, from_id in rows])
+    return [from_id for _, from_id in rows]
+
+
+def upsert_friend_suggestions(items: Iterable[Dict[str, Any]], batch_size: int = 1000) -> int:
+    """Bulk upsert FriendSuggestion rows; returns the number of pairs written.
+
+    Each item carries `user_id`, `suggested_user_id` and optionally
+    `similarity_score` / `shared_genres`. Items are grouped by which optional
+    fields they provide and each group is written with one
+    INSERT ... ON CONFLICT DO UPDATE per batch, so omitted fields keep their
+    stored values and `status` is never reset. Duplicate pairs: last wins.
+    """
+    latest: Dict[tuple, Dict[str, Any]] = {}
+    for item in items:
+        latest[(item["user_id"], item["suggested_user_id"])] = item
+    groups: Dict[tuple, list] = defaultdict(list)
+    for (user_id, suggested_user_id), item in latest.items():
+        fields = tuple(f for f in SUGGESTION_FIELDS if item.get(f) is not None)
+        groups[fields].append(
+            FriendSuggestion(
+                user_id=user_id,
+                suggested_user_id=suggested_user_id,
+                **{f: item[f] for f in fields},
+            )
+        )
+    with transaction.atomic():
+        for fields, objs in groups.items():
+            if fields:
+                FriendSuggestion.objects.bulk_create(
+                    objs,
+                    batch_size=batch_size,
+                    update_conflicts=True,
+                    unique_fields=("user", "suggested_user_id"),
+                    update_fields=fields,
+                )
+            else:
+                FriendSuggestion.objects.bulk_create(
+                    objs, batch_size=batch_size, ignore_conflicts=True
+                )
+    return len(latest)
+
+
+def _growth(at: datetime, epoch: datetime, half_life_seconds: float) -> float:
+    return 2.0 ** ((at - epoch).total_seconds() / half_life_seconds)
+
+
+def refresh_popularity(now: Optional[datetime] = None, chunk_size: int = 500) -> int:
+    """Incrementally update `MovieStats.popularity`; returns movies touched.
+
+    Scores decay exponentially with half-life POPULARITY_HALF_LIFE_HOURS.
+    They are stored relative to the checkpoint epoch as
+    `sum(weight * 2 ** ((created_at - epoch) / half_life))`, which ranks
+    movies exactly like the decayed score at any moment, so a run only
+    writes the rows of movies with new events. Events are scanned up to
+    `now - POPULARITY_COMMIT_LAG`; each is counted once regardless of when
+    it is folded in. Every POPULARITY_REBASE_HALF_LIVES half-lives all
+    scores are rescaled to a newer epoch in one UPDATE.
+    """
+    now = now or timezone.now()
+    upto = now - POPULARITY_COMMIT_LAG
+    half_life = float(getattr(settings, "POPULARITY_HALF_LIFE_HOURS", 72)) * 3600.0
+    with transaction.atomic():
+        checkpoint, _ = PopularityCheckpoint.objects.select_for_update().get_or_create(pk=1)
+        since = checkpoint.computed_at
+        if since and upto <= since:
+            return 0
+        epoch = checkpoint.epoch or upto
+        if (upto - epoch).total_seconds() / half_life > POPULARITY_REBASE_HALF_LIVES:
+            MovieStats.objects.filter(popularity__gt=0).update(
+                popularity=F("popularity") / _growth(upto, epoch, half_life)
+            )
+            epoch = upto
+
+        gains: Dict[int, float] = defaultdict(float)
+        for model, weight in POPULARITY_WEIGHTS:
+            qs = model.objects.filter(created_at__lte=upto)
+            if since:
+                qs = qs.filter(created_at__gt=since)
+            for movie_id, created_at in qs.values_list("movie_id", "created_at").iterator():
+                gains[movie_id] += weight * _growth(created_at, epoch, half_life)
+
+        movie_ids = list(gains)
+        for i in range(0, len(movie_ids), chunk_size):
+            chunk = movie_ids[i:i + chunk_size]
+            MovieStats.objects.bulk_create(
+                [MovieStats(movie_id=movie_id) for movie_id in chunk],
+                ignore_conflicts=True,
+            )
+            MovieStats.objects.filter(movie_id__in=chunk).update(
+                popularity=F("popularity")
+                + Case(
+                    *[When(movie_id=movie_id, then=Value(gains[movie_id])) for movie_id in chunk],
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                )
+            )
+
+        checkpoint.computed_at = upto
+        checkpoint.epoch = epoch
+        checkpoint.save(update_fields=["computed_at", "epoch"])
+    logger.debug(
+        "refresh_popularity: since=%s upto=%s movies=%s", since, upto, len(movie_ids)
+    )
+    return len(movie_ids)
+
+
+def _tally_cache_key(movie_night_id: int) -> str:
+    return f"social:movie_night:tally:{movie_night_id}"
+
+
+def movie_night_vote_tally(movie_night_id: int) -> Dict[str, Any]:
+    """Per-movie vote counts and the current leader for a movie night.
+
+    One GROUP BY over the night's votes, cached per night until the next
+    vote (see `invalidate_movie_night_tally`).
+    """
+    key = _tally_cache_key(movie_night_id)
+    tally = cache.get(key)
+    if tally is not None:
+        return tally
+    results = list(
+        MovieNightVote.objects.filter(movie_night_id=movie_night_id)
+        .values("movie_id", "movie__imdb_id", "movie__title", "movie__poster")
+        .annotate(votes=Count("id"))
+        .order_by("-votes", "movie_id")
+    )
+    results = [
+        {
+            "movie_id": row["movie_id"],
+            "imdb_id": row["movie__imdb_id"],
+            "title": row["movie__title"],
+            "poster": row["movie__poster"],
+            "votes": row["votes"],
+        }
+        for row in results
+    ]
+    leader = results[0] if results else None
+    tally = {
+        "movie_night_id": movie_night_id,
+        "total_votes": sum(r["votes"] for r in results),
+        "leader": leader,
+        "tied": len(results) > 1 and results[1]["votes"] == leader["votes"],
+        "results": results,
+    }
+    cache.set(key, tally, TALLY_CACHE_TTL)
+    return tally
+
+
+def invalidate_movie_night_tally(movie_night_id: int) -> None:
+    """Drop the cached tally once a vote write commits.
+
+    The delete reaches other workers only through a shared default cache
+    (`CACHE_URL`); with the per-process fallback they serve the old tally
+    until TALLY_CACHE_TTL expires.
+    """
+    transaction.on_commit(lambda: cache.delete(_tally_cache_key(movie_night_id)))
@@ -7,16 +7,26 @@ from .views import (
     ReviewListCreateView,
     SocialStatsView,
     ReviewSentimentAnalysisView,
+    ReviewSentimentStatusView,
     GenerateSocialPostView,
     FriendRequestListCreateView,
+    FriendRequestCountView,
+    FriendRequestBulkAcceptView,
     FriendRequestUpdateView,
     FriendshipListView,
+    FriendshipDeleteView,
+    MutualFriendsView,
+    MutualFriendCountsView,
+    FriendOfFriendSuggestionsView,
     MovieNightListCreateView,
     MovieNightDetailView,
     MovieNightParticipantView,
     MovieNightInviteView,
     MovieNightVoteView,
+    MovieNightVoteTallyView,
     FriendSuggestionsView,
+    FriendSuggestionsComputeView,
+    FriendSuggestionsBatchView,
     UsersByGenreView,
     RecentFavoritesView,
     UsersInterestedInTrendingView,
@@ -51,6 +61,11 @@ urlpatterns = [
         ReviewListCreateView.as_view(),
         name="review_list_create",
     ),
+    path(
+        "reviews/<int:review_id>/sentiment/",
+        ReviewSentimentStatusView.as_view(),
+        name="review_sentiment_status",
+    ),
     path(
         "stats/<str:imdb_id>/",
         SocialStatsView.as_view(),
@@ -73,11 +88,41 @@ urlpatterns = [
         FriendshipListView.as_view(),
         name="friendship_list",
     ),
+    path(
+        "friends/mutual-counts/",
+        MutualFriendCountsView.as_view(),
+        name="mutual_friend_counts",
+    ),
+    path(
+        "friends/suggestions/",
+        FriendOfFriendSuggestionsView.as_view(),
+        name="friend_of_friend_suggestions",
+    ),
+    path(
+        "friends/<int:user_id>/",
+        FriendshipDeleteView.as_view(),
+        name="friendship_delete",
+    ),
+    path(
+        "friends/<int:user_id>/mutual/",
+        MutualFriendsView.as_view(),
+        name="mutual_friends",
+    ),
     path(
         "friend-requests/",
         FriendRequestListCreateView.as_view(),
         name="friend_request_list_create",
     ),
+    path(
+        "friend-requests/count/",
+        FriendRequestCountView.as_view(),
+        name="friend_request_count",
+    ),
+    path(
+        "friend-requests/accept/",
+        FriendRequestBulkAcceptView.as_view(),
+        name="friend_request_bulk_accept",
+    ),
     path(
         "friend-requests/<int:pk>/",
         FriendRequestUpdateView.as_view(),
@@ -109,11 +154,26 @@ urlpatterns = [
         MovieNightVoteView.as_view(),
         name="movie_night_vote",
     ),
+    path(
+        "movie-nights/<int:pk>/votes/tally/",
+        MovieNightVoteTallyView.as_view(),
+        name="movie_night_vote_tally",
+    ),
     path(
         "friend-suggestions/",
         FriendSuggestionsView.as_view(),
         name="friend_suggestions",
     ),
+    path(
+        "friend-suggestions/batch/",
+        FriendSuggestionsBatchView.as_view(),
+        name="friend_suggestions_batch",
+    ),
+    path(
+        "friend-suggestions/compute/",
+        FriendSuggestionsComputeView.as_view(),
+        name="friend_suggestions_compute",
+    ),
     path(
         "users-by-genre/",
         UsersByGenreView.as_view(),
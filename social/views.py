@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import logging
 
-from django.db.models import Q, Count
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
@@ -10,10 +12,27 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.throttling import ScopedRateThrottle
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.utils.urls import replace_query_param
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from analytics.authentication import N8NSharedSecretAuthentication
+from movie_social_backend.pagination import KeysetPagination
 from movies.models import Movie
+from movies.services import genre_slugs
+from .services import (
+    accept_friend_request,
+    accept_pending_friend_requests,
+    bump_movie_stats,
+    invalidate_movie_night_tally,
+    movie_night_vote_tally,
+    remove_activity,
+    upsert_friend_suggestions,
+)
+from .graph import friend_graph
+from .recommendations import suggestion_runner
 from .models import (
+    Activity,
     Favorite,
     Like,
     Review,
@@ -21,7 +40,6 @@ from .models import (
     FriendRequest,
     MovieNight,
     MovieNightParticipant,
-    FriendSuggestion,
 )
 from .serializers import (
     FavoriteSerializer,
@@ -29,24 +47,26 @@ from .serializers import (
     FavoriteWithUserSerializer,
     LikeToggleSerializer,
     LikeSimpleSerializer,
-    LikeWithUserSerializer,
     ReviewSerializer,
     ReviewActivitySerializer,
     ShareSerializer,
+    ActivitySerializer,
+    FriendSuggestionItemSerializer,
     SocialStatsSerializer,
     SocialPostGenerateSerializer,
     TrendingUsersInputSerializer,
     FriendshipSerializer,
     FriendRequestSerializer,
     MovieNightSerializer,
+    MovieNightSummarySerializer,
     MovieNightParticipantSerializer,
     MovieNightVoteSerializer,
 )
 from notifications.services import (
     gemini_advanced_sentiment,
     gemini_generate_social_posts,
+    recently_notified,
 )
-from notifications.models import Notification
 from users.serializers import UserSerializer
 
 logger = logging.getLogger(__name__)
@@ -80,7 +100,12 @@ class FavoriteDeleteView(APIView):
                 {"detail": "Favorite not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        fav.delete()
+        with transaction.atomic():
+            # a concurrent unfavorite may have deleted the row already
+            deleted, _ = Favorite.objects.filter(pk=fav.pk).delete()
+            if deleted:
+                bump_movie_stats(fav.movie_id, favorites=-1)
+                remove_activity(Activity.VERB_FAVORITE, fav.pk)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -111,6 +136,7 @@ class ReviewListCreateView(generics.ListCreateAPIView):
 
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         imdb_id = self.request.query_params.get("imdb_id")
@@ -121,25 +147,76 @@ class ReviewListCreateView(generics.ListCreateAPIView):
 
 
 class SocialStatsView(APIView):
-    """Get social stats (likes, favorites, reviews) for a movie by IMDB id."""
+    """Get social stats (likes, favorites, reviews, shares) for a movie by IMDB id.
+
+    Reads the denormalized `MovieStats` counters in a single query.
+    """
 
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, imdb_id: str):
-        movie = Movie.objects.filter(imdb_id=imdb_id).first()
-        if not movie:
+        row = (
+            Movie.objects.filter(imdb_id=imdb_id)
+            .values(
+                "stats__likes",
+                "stats__favorites",
+                "stats__reviews",
+                "stats__shares",
+            )
+            .first()
+        )
+        if not row:
             return Response(
                 {"detail": "Movie not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
         stats = {
-            "likes": Like.objects.filter(movie=movie).count(),
-            "favorites": Favorite.objects.filter(movie=movie).count(),
-            "reviews": Review.objects.filter(movie=movie).count(),
+            name: row.get(f"stats__{name}") or 0
+            for name in ("likes", "favorites", "reviews", "shares")
         }
         return Response(SocialStatsSerializer(stats).data)
 
 
+class ReviewSentimentStatusView(APIView):
+    """Poll the background sentiment result of a review.
+
+    Returns `status` (pending|processing|done|failed) and, once done, the
+    sentiment fields.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, review_id: int):
+        row = (
+            Review.objects.filter(id=review_id)
+            .values(
+                "id",
+                "sentiment_status",
+                "sentiment",
+                "sentiment_confidence",
+                "emotions",
+                "sentiment_breakdown",
+            )
+            .first()
+        )
+        if not row:
+            return Response(
+                {"detail": "Review not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        done = row["sentiment_status"] == Review.SENTIMENT_DONE
+        return Response(
+            {
+                "id": row["id"],
+                "status": row["sentiment_status"],
+                "overall": row["sentiment"] if done else None,
+                "confidence": row["sentiment_confidence"] if done else None,
+                "emotions": row["emotions"] if done else {},
+                "breakdown": row["sentiment_breakdown"] if done else {},
+            }
+        )
+
+
 class ReviewSentimentAnalysisView(APIView):
     """Run Gemini sentiment analysis on a review and save results."""
 
@@ -170,12 +247,14 @@ class ReviewSentimentAnalysisView(APIView):
             review.sentiment_confidence = adv.get("confidence")
             review.emotions = adv.get("emotions") or {}
             review.sentiment_breakdown = adv.get("breakdown") or {}
+            review.sentiment_status = Review.SENTIMENT_DONE
             review.save(
                 update_fields=[
                     "sentiment",
                     "sentiment_confidence",
                     "emotions",
                     "sentiment_breakdown",
+                    "sentiment_status",
                 ]
             )
             logger.debug(
@@ -248,19 +327,59 @@ class GenerateSocialPostView(APIView):
 # ---- Friend System Views ----
 
 
+def _friend_request_filters(
+    request, direction: str = "all", status: str | None = None
+) -> tuple[str, str | None]:
+    """Parse `direction` (incoming|outgoing|all) and `status` query params."""
+    direction = request.query_params.get("direction", direction)
+    if direction not in ("incoming", "outgoing", "all"):
+        raise ValidationError({"direction": "Must be incoming, outgoing or all."})
+    req_status = request.query_params.get("status", status) or None
+    if req_status and req_status not in dict(FriendRequest.STATUS_CHOICES):
+        raise ValidationError({"status": "Unknown status."})
+    return direction, req_status
+
+
+def _friend_requests_for(
+    user, direction: str, req_status: str | None, select_users: bool = False
+):
+    """Friend requests touching user, one indexed lookup per direction.
+
+    `incoming` and `outgoing` hit the (to_user|from_user, status, -created_at)
+    indexes directly; `all` combines both with UNION ALL instead of an OR,
+    which Postgres cannot serve from either index. A user never sends a
+    request to themselves, so the two halves are disjoint.
+    """
+    extra = {"status": req_status} if req_status else {}
+    # Meta.ordering is cleared: ORDER BY is not allowed inside UNION halves
+    incoming = FriendRequest.objects.filter(to_user=user, **extra).order_by()
+    outgoing = FriendRequest.objects.filter(from_user=user, **extra).order_by()
+    if select_users:
+        incoming = incoming.select_related("from_user", "to_user")
+        outgoing = outgoing.select_related("from_user", "to_user")
+    if direction == "incoming":
+        return incoming
+    if direction == "outgoing":
+        return outgoing
+    return incoming.union(outgoing, all=True)
+
+
 class FriendRequestListCreateView(generics.ListCreateAPIView):
-    """List related friend requests or create a new one."""
+    """List related friend requests or create a new one.
+
+    Query params: `direction` (incoming|outgoing|all, default all) and
+    `status` (pending|accepted|declined).
+    """
 
     serializer_class = FriendRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-        return (
-            FriendRequest.objects.filter(Q(from_user=user) | Q(to_user=user))
-            .select_related("from_user", "to_user")
-            .order_by("-created_at")
+        direction, req_status = _friend_request_filters(self.request)
+        qs = _friend_requests_for(
+            self.request.user, direction, req_status, select_users=True
         )
+        return qs.order_by("-created_at")
 
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
@@ -268,11 +387,28 @@ class FriendRequestListCreateView(generics.ListCreateAPIView):
         return ctx
 
 
+class FriendRequestCountView(APIView):
+    """Count friend requests for badges, e.g. `?direction=incoming&status=pending`.
+
+    Defaults to pending incoming requests; answered from the inbox index.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        direction, req_status = _friend_request_filters(
+            request, direction="incoming", status=FriendRequest.STATUS_PENDING
+        )
+        count = _friend_requests_for(request.user, direction, req_status).count()
+        return Response({"direction": direction, "status": req_status, "count": count})
+
+
 class FriendRequestUpdateView(generics.UpdateAPIView):
     """Accept/decline a friend request by updating `status`.
 
     Only the recipient (`to_user`) can update. When accepted, create
-    reciprocal `Friendship` rows.
+    reciprocal `Friendship` rows in the same transaction. Accepting an
+    already-accepted request is a no-op; a declined one returns 409.
     """
 
     serializer_class = FriendRequestSerializer
@@ -287,17 +423,13 @@ class FriendRequestUpdateView(generics.UpdateAPIView):
             )
         action = request.data.get("action")  # "accept" or "decline"
         if action == "accept":
-            instance.status = FriendRequest.STATUS_ACCEPTED
-            instance.save(update_fields=["status", "updated_at"])
-            # create friendships both directions
-            Friendship.objects.get_or_create(
-                user=instance.from_user,
-                friend=instance.to_user,
-            )
-            Friendship.objects.get_or_create(
-                user=instance.to_user,
-                friend=instance.from_user,
-            )
+            if not accept_friend_request(instance):
+                instance.refresh_from_db(fields=["status", "updated_at"])
+                if instance.status != FriendRequest.STATUS_ACCEPTED:
+                    return Response(
+                        {"detail": "Request is no longer pending."},
+                        status=status.HTTP_409_CONFLICT,
+                    )
         elif action == "decline":
             instance.status = FriendRequest.STATUS_DECLINED
             instance.save(update_fields=["status", "updated_at"])
@@ -321,6 +453,28 @@ class FriendRequestUpdateView(generics.UpdateAPIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class FriendRequestBulkAcceptView(APIView):
+    """Accept many pending incoming requests in one transaction.
+
+    POST `{"ids": [<request_id>, ...]}` or `{"all": true}` for every pending
+    request addressed to the current user.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        ids = request.data.get("ids")
+        if request.data.get("all"):
+            ids = None
+        elif not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+            return Response(
+                {"detail": "Provide ids as a list of integers or all=true."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        friend_ids = accept_pending_friend_requests(request.user.id, ids)
+        return Response({"accepted": len(friend_ids), "friend_ids": friend_ids})
+
+
 class FriendshipListView(generics.ListAPIView):
     """List current user's friends."""
 
@@ -335,14 +489,111 @@ class FriendshipListView(generics.ListAPIView):
         )
 
 
+class FriendshipDeleteView(APIView):
+    """Unfriend: DELETE removes both directed `Friendship` rows.
+
+    The pair's `FriendRequest` rows are deleted in the same transaction so
+    either user can send a fresh request later; otherwise `get_or_create`
+    would hand back the old accepted request and accepting it would no-op.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def delete(self, request, user_id: int):
+        me = request.user.id
+        with transaction.atomic():
+            deleted, _ = Friendship.objects.filter(
+                Q(user_id=me, friend_id=user_id) | Q(user_id=user_id, friend_id=me)
+            ).delete()
+            if deleted:
+                FriendRequest.objects.filter(
+                    Q(from_user_id=me, to_user_id=user_id)
+                    | Q(from_user_id=user_id, to_user_id=me)
+                ).delete()
+                transaction.on_commit(
+                    lambda: friend_graph.remove_friendship(me, user_id)
+                )
+        if not deleted:
+            return Response(
+                {"detail": "Not friends."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class MutualFriendsView(APIView):
+    """Mutual friends between the current user and `user_id`.
+
+    Served from the in-memory friendship graph; no database query.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, user_id: int):
+        ids = friend_graph.mutual_friends(request.user.id, user_id)
+        return Response({"user_id": user_id, "count": len(ids), "mutual_friend_ids": ids})
+
+
+class MutualFriendCountsView(APIView):
+    """Mutual-friend counts between the current user and a list of users.
+
+    Query param: `user_ids` as a comma-separated list (max 500).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    max_user_ids = 500
+
+    def get(self, request):
+        raw = request.query_params.get("user_ids", "")
+        try:
+            user_ids = [int(x) for x in raw.split(",") if x.strip()]
+        except ValueError:
+            return Response(
+                {"detail": "user_ids must be comma-separated integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        counts = friend_graph.mutual_counts(request.user.id, user_ids[: self.max_user_ids])
+        return Response({"counts": {str(k): v for k, v in counts.items()}})
+
+
+class FriendOfFriendSuggestionsView(APIView):
+    """Friend-of-friend candidates for the current user ranked by mutual friends.
+
+    Query param: `limit` (default 20, max 100).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", 20))
+        except (TypeError, ValueError):
+            limit = 20
+        limit = max(1, min(limit, 100))
+        pairs = friend_graph.friends_of_friends(request.user.id, limit=limit)
+        return Response(
+            {"results": [{"user_id": u, "mutual_count": n} for u, n in pairs]}
+        )
+
+
 # ---- Movie Night Views ----
 
 
 class MovieNightListCreateView(generics.ListCreateAPIView):
-    """List or create movie nights."""
+    """List or create movie nights.
+
+    The list uses `MovieNightSummarySerializer`: participant counts by status,
+    the first `preview_size` accepted participants and the caller's own
+    status, all from annotations and one sliced prefetch. Create returns
+    the full nested representation.
+    """
 
-    serializer_class = MovieNightSerializer
     permission_classes = [permissions.IsAuthenticated]
+    preview_size = 5
+
+    def get_serializer_class(self):
+        if self.request.method == "GET":
+            return MovieNightSummarySerializer
+        return MovieNightSerializer
 
     def get_queryset(self):
         user = self.request.user
@@ -351,18 +602,39 @@ class MovieNightListCreateView(generics.ListCreateAPIView):
             MovieNightParticipant.STATUS_ACCEPTED,
             MovieNightParticipant.STATUS_MAYBE,
         ]
+        mine = MovieNightParticipant.objects.filter(
+            movie_night=OuterRef("pk"), user=user
+        )
+        # EXISTS instead of a join keeps one row per night for the counts
+        counts = {
+            f"{value}_count": Count("participants", filter=Q(participants__status=value))
+            for value, _ in MovieNightParticipant.STATUS_CHOICES
+        }
+        preview = (
+            MovieNightParticipant.objects.filter(
+                status=MovieNightParticipant.STATUS_ACCEPTED
+            )
+            .select_related("user")
+            .only(
+                "movie_night_id",
+                "user__id",
+                "user__username",
+                "user__display_name",
+                "user__avatar_url",
+            )
+            .order_by("joined_at", "id")[: self.preview_size]
+        )
         return (
             MovieNight.objects.filter(
                 Q(organizer=user)
-                | Q(
-                    participants__user=user,
-                    participants__status__in=visible_statuses,
-                )
+                | Exists(mine.filter(status__in=visible_statuses))
             )
             .select_related("organizer")
-            .prefetch_related("participants__user")
+            .annotate(my_status=Subquery(mine.values("status")[:1]), **counts)
+            .prefetch_related(
+                Prefetch("participants", queryset=preview, to_attr="preview_participants")
+            )
             .order_by("-created_at")
-            .distinct()
         )
 
     def get_serializer_context(self):
@@ -371,7 +643,6 @@ class MovieNightListCreateView(generics.ListCreateAPIView):
         return ctx
 
 
-
 class MovieNightDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a movie night.
 
@@ -602,20 +873,75 @@ class MovieNightVoteView(generics.CreateAPIView):
         ctx.update({"request": self.request, "movie_night": movie_night})
         return ctx
 
+    def perform_create(self, serializer):
+        vote = serializer.save()
+        invalidate_movie_night_tally(vote.movie_night_id)
+
+
+class MovieNightVoteTallyView(APIView):
+    """Per-movie vote counts and the current leader for a movie night.
+
+    Visible to the organizer and accepted participants (same rule as the
+    votes on the detail view). Served from a per-night cache.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk: int):
+        accepted = MovieNightParticipant.objects.filter(
+            movie_night=OuterRef("pk"),
+            user=request.user,
+            status=MovieNightParticipant.STATUS_ACCEPTED,
+        )
+        allowed = MovieNight.objects.filter(
+            Q(organizer=request.user) | Exists(accepted), pk=pk
+        ).exists()
+        if not allowed:
+            return Response(
+                {"detail": "Movie night not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(movie_night_vote_tally(pk))
+
 
 class UsersByGenreView(APIView):
     """Find users who engaged with movies in any of the given genres.
 
     Query params:
     - genres: comma-separated list (e.g. "Action,Drama,Comedy")
+    - limit: optional page size (max 1000); pages by user id
+    - after: return users with id greater than this (from `next`)
 
     Response includes: id, username, email, and a small preferences summary.
+    The audience is selected with EXISTS filters and each user's favorite
+    and like counts with correlated COUNT subqueries, so no per-user join
+    fan-out or GROUP BY is needed. Without `limit` or `after` every
+    matching user is returned and `next` is null.
     """
 
     permission_classes = [permissions.IsAuthenticated]
     throttle_classes = [ScopedRateThrottle]
     throttle_scope = "llm"
 
+    max_limit = 1000
+
+    @staticmethod
+    def _engagements(model, slugs):
+        """`model` rows of the outer user whose movie has any of the genres."""
+        in_genres = Movie.genres.through.objects.filter(
+            movie_id=OuterRef("movie_id"), genre__slug__in=slugs
+        )
+        return model.objects.filter(user_id=OuterRef("pk")).filter(Exists(in_genres))
+
+    @staticmethod
+    def _count(qs):
+        return Coalesce(
+            Subquery(
+                qs.order_by().values("user_id").annotate(n=Count("pk")).values("n")[:1]
+            ),
+            0,
+        )
+
     def get(self, request):
         genres_param = request.query_params.get("genres", "")
         if not genres_param.strip():
@@ -626,71 +952,91 @@ class UsersByGenreView(APIView):
 
         genres = [g.strip() for g in genres_param.split(",") if g.strip()]
         if not genres:
-            return Response({"users": [], "count": 0})
+            return Response({"users": [], "count": 0, "next": None})
+        paginate = "limit" in request.query_params or "after" in request.query_params
+        try:
+            limit = int(request.query_params.get("limit", self.max_limit))
+        except (TypeError, ValueError):
+            limit = self.max_limit
+        limit = max(1, min(limit, self.max_limit))
+        try:
+            after = int(request.query_params.get("after", 0))
+        except (TypeError, ValueError):
+            after = 0
 
-        # Build engagement filter over favorites and likes
-        q = Q()
-        for g in genres:
-            q |= Q(favorites__movie__genre__icontains=g)
-            q |= Q(likes__movie__genre__icontains=g)
+        slugs = genre_slugs(genres)
+        favorites = self._engagements(Favorite, slugs)
+        likes = self._engagements(Like, slugs)
 
         User = get_user_model()
 
         # Anti-spam: exclude users with recent notifications (last 24h)
-        cutoff = timezone.now() - timedelta(hours=24)
-        recent_notified_user_ids = set(
-            Notification.objects.filter(sent_at__gte=cutoff)
-            .values_list("user_id", flat=True)
+        qs = (
+            User.objects.filter(Exists(favorites) | Exists(likes), id__gt=after)
+            .filter(~recently_notified(hours=24))
+            .values("id", "username", "email")
+            .annotate(fav_count=self._count(favorites), like_count=self._count(likes))
+            .order_by("id")
         )
+        rows = list(qs[: limit + 1]) if paginate else list(qs)
+        has_next = paginate and len(rows) > limit
+        if paginate:
+            rows = rows[:limit]
 
-        users_qs = (
-            User.objects.filter(q)
-            .exclude(id__in=recent_notified_user_ids)
-            .distinct()
+        users = [
+            {
+                "id": u["id"],
+                "username": u.get("username") or "",
+                "email": u.get("email") or "",
+                "preferences": {
+                    "total_engagements": u["fav_count"] + u["like_count"],
+                    "favorites": u["fav_count"],
+                    "likes": u["like_count"],
+                },
+            }
+            for u in rows
+        ]
+        next_url = None
+        if has_next and rows:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "after", rows[-1]["id"]
+            )
+        return Response({"users": users, "count": len(users), "next": next_url})
+
+
+def _parse_suggestions(user_id: int, suggestions) -> tuple[list[dict], int]:
+    """Validate raw suggestion items for user_id; returns (items, skipped)."""
+    items: list[dict] = []
+    skipped = 0
+    if not isinstance(suggestions, list):
+        return items, skipped
+    for raw in suggestions:
+        serializer = FriendSuggestionItemSerializer(
+            data=raw if isinstance(raw, dict) else {}
         )
+        if not serializer.is_valid():
+            skipped += 1
+            continue
+        items.append({"user_id": user_id, **serializer.validated_data})
+    return items, skipped
 
-        # Summarize preference data per user
-        def _engagement_counts(user_id: int) -> dict:
-            genre_q = Q()
-            for g in genres:
-                genre_q |= Q(movie__genre__icontains=g)
-            fav_count = (
-                Favorite.objects.filter(user_id=user_id)
-                .filter(genre_q)
-                .count()
-            )
-            like_count = (
-                Like.objects.filter(user_id=user_id)
-                .filter(genre_q)
-                .count()
-            )
-            return {
-                "total_engagements": fav_count + like_count,
-                "favorites": fav_count,
-                "likes": like_count,
-            }
 
-        users = []
-        for u in users_qs.values("id", "username", "email"):
-            users.append(
-                {
-                    "id": u["id"],
-                    "username": u.get("username") or "",
-                    "email": u.get("email") or "",
-                    "preferences": _engagement_counts(u["id"]),
-                }
-            )
+class IsStaffOrN8N(permissions.BasePermission):
+    """Allow staff users or requests authenticated with the n8n shared secret."""
 
-        return Response({"users": users, "count": len(users)})
+    def has_permission(self, request, view) -> bool:  # type: ignore[override]
+        if request.auth == "n8n":
+            return True
+        return bool(request.user and request.user.is_staff)
 
 
 class FriendSuggestionsView(APIView):
-    """Receive friend suggestions from n8n and log them.
+    """Receive friend suggestions for the authenticated user from n8n.
 
-    POST only. Requires authentication. Payload is expected to be JSON from the
-    recommendation pipeline (n8n). We log for debugging and, when possible,
-    upsert `FriendSuggestion` rows for the authenticated user. Returns 201 on
-    success with a short summary. Errors are handled gracefully with a 400.
+    POST only. Payload: `{"suggestions": [{"suggested_user_id", "similarity_score",
+    "shared_genres"}, ...]}`. Valid items are upserted in one bulk statement;
+    invalid items are skipped and counted. Returns 201 with a short summary,
+    or 400 on a malformed payload.
     """
 
     permission_classes = [permissions.IsAuthenticated]
@@ -698,63 +1044,14 @@ class FriendSuggestionsView(APIView):
     def post(self, request):
         try:
             data = request.data or {}
-            logger.debug(
-                "friend_suggestions: user=%s payload=%s",
-                request.user.id,
-                data,
-            )
-
-            # Optional persistence if payload contains structured suggestions
-            suggestions = data.get("suggestions")
-            saved = 0
-            if isinstance(suggestions, list):
-                for item in suggestions:
-                    try:
-                        suggested_user_id = (
-                            item.get("suggested_user_id")
-                            if isinstance(item, dict)
-                            else None
-                        )
-                        # Some flows might provide `user_id` instead
-                        if suggested_user_id is None and isinstance(item, dict):
-                            suggested_user_id = item.get("user_id")
-                        if not isinstance(suggested_user_id, int):
-                            continue
-                        similarity_score = (
-                            item.get("similarity_score")
-                            if isinstance(item, dict)
-                            else None
-                        )
-                        shared_genres = (
-                            item.get("shared_genres")
-                            if isinstance(item, dict)
-                            else None
-                        )
-                        defaults = {}
-                        if similarity_score is not None:
-                            defaults["similarity_score"] = similarity_score
-                        if shared_genres is not None:
-                            defaults["shared_genres"] = shared_genres
-                        FriendSuggestion.objects.update_or_create(
-                            user=request.user,
-                            suggested_user_id=suggested_user_id,
-                            defaults=defaults,
-                        )
-                        saved += 1
-                    except Exception:  # pragma: no cover - best-effort per item
-                        logger.exception(
-                            (
-                                "friend_suggestions: "
-                                "failed to upsert item for user=%s"
-                            ),
-                            request.user.id,
-                        )
-
+            items, skipped = _parse_suggestions(request.user.id, data.get("suggestions"))
+            saved = upsert_friend_suggestions(items) if items else 0
             return Response(
                 {
                     "detail": "Friend suggestions received.",
                     "received": bool(data),
                     "saved": saved,
+                    "skipped": skipped,
                 },
                 status=status.HTTP_201_CREATED,
             )
@@ -772,6 +1069,102 @@ class FriendSuggestionsView(APIView):
             )
 
 
+class FriendSuggestionsBatchView(APIView):
+    """Receive friend suggestions for many users in one request.
+
+    POST `{"users": [{"user_id": <int>, "suggestions": [...]}, ...]}`.
+    Auth: staff JWT or X-N8N-SECRET. Entries for unknown users are skipped;
+    all valid suggestions are written with one bulk upsert.
+    """
+
+    authentication_classes = [N8NSharedSecretAuthentication, JWTAuthentication]
+    permission_classes = [IsStaffOrN8N]
+
+    def post(self, request):
+        entries = (request.data or {}).get("users")
+        if not isinstance(entries, list):
+            return Response(
+                {"detail": "users must be a list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        wanted = {
+            e.get("user_id")
+            for e in entries
+            if isinstance(e, dict) and isinstance(e.get("user_id"), int)
+        }
+        known = set(
+            get_user_model().objects.filter(id__in=wanted).values_list("id", flat=True)
+        )
+        items: list[dict] = []
+        skipped = 0
+        skipped_users = 0
+        for entry in entries:
+            user_id = entry.get("user_id") if isinstance(entry, dict) else None
+            if user_id not in known:
+                skipped_users += 1
+                continue
+            parsed, bad = _parse_suggestions(user_id, entry.get("suggestions"))
+            items.extend(parsed)
+            skipped += bad
+        saved = upsert_friend_suggestions(items) if items else 0
+        return Response(
+            {
+                "detail": "Friend suggestions received.",
+                "users": len(known),
+                "saved": saved,
+                "skipped": skipped,
+                "skipped_users": skipped_users,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class FriendSuggestionsComputeView(APIView):
+    """Queue a run of the genre-similarity recommendation engine.
+
+    POST `{"user_ids": [<int>, ...]}` to recompute those users or
+    `{"all": true}` for everyone; optional `top_k` (default 10, max 50).
+    Auth: staff JWT or X-N8N-SECRET, throttled under the
+    `friend_suggestions` scope. The work runs in a background thread
+    against a cached affinity matrix; returns 202 Accepted.
+    """
+
+    authentication_classes = [N8NSharedSecretAuthentication, JWTAuthentication]
+    permission_classes = [IsStaffOrN8N]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "friend_suggestions"
+
+    max_user_ids = 1000
+
+    def post(self, request):
+        data = request.data or {}
+        try:
+            top_k = int(data.get("top_k", 10))
+        except (TypeError, ValueError):
+            top_k = 10
+        top_k = max(1, min(top_k, 50))
+        if data.get("all"):
+            suggestion_runner.submit(top_k=top_k)
+            return Response(
+                {"detail": "Friend suggestion run queued for all users."},
+                status=status.HTTP_202_ACCEPTED,
+            )
+        user_ids = data.get("user_ids")
+        if not isinstance(user_ids, list) or not user_ids:
+            raise ValidationError({"user_ids": "Provide a non-empty list, or all: true."})
+        if len(user_ids) > self.max_user_ids:
+            raise ValidationError({"user_ids": f"At most {self.max_user_ids} ids per request."})
+        try:
+            user_ids = sorted({int(u) for u in user_ids})
+        except (TypeError, ValueError):
+            raise ValidationError({"user_ids": "Ids must be integers."})
+        suggestion_runner.submit(user_ids, top_k=top_k)
+        return Response(
+            {"detail": "Friend suggestion run queued.", "user_ids": user_ids},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
 # ---- New Social Endpoints ----
 
 
@@ -784,6 +1177,7 @@ class RecentFavoritesView(generics.ListAPIView):
 
     serializer_class = FavoriteWithUserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         try:
@@ -933,88 +1327,40 @@ class UserMovieHistoryView(APIView):
         return Response(payload)
 
 
-class FriendsActivityView(APIView):
+class FriendsActivityPagination(KeysetPagination):
+    """Keyset pages for the friends feed; `limit` kept as the size param."""
+
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = "limit"
+
+
+class FriendsActivityView(generics.ListAPIView):
     """Return friends' recent activity (favorites, likes, reviews).
 
+    Served from the `Activity` stream with a single indexed query over the
+    user's friends, newest first, keyset paginated (follow `next`).
+
     Path param: user_id
     Query params:
     - minutes: window size (default 1440)
-    - limit: max items to return (default 50)
+    - limit: page size (default 50, max 200)
     """
 
+    serializer_class = ActivitySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = FriendsActivityPagination
 
-    def get(self, request, user_id: int):
+    def get_queryset(self):
         try:
-            minutes = int(request.query_params.get("minutes", 1440))
+            minutes = int(self.request.query_params.get("minutes", 1440))
         except (TypeError, ValueError):
             minutes = 1440
-        try:
-            limit = int(request.query_params.get("limit", 50))
-        except (TypeError, ValueError):
-            limit = 50
-        limit = max(1, min(limit, 200))
-
         cutoff = timezone.now() - timedelta(minutes=max(1, minutes))
-        friend_ids = list(
-            Friendship.objects.filter(user_id=user_id).values_list(
-                "friend_id", flat=True
-            )
-        )
-        if not friend_ids:
-            return Response({"activities": [], "count": 0})
-
-        favs = list(
-            Favorite.objects.filter(
-                user_id__in=friend_ids, created_at__gte=cutoff
-            )
-            .select_related("user", "movie")
-            .order_by("-created_at")[: limit * 2]
-        )
-        likes = list(
-            Like.objects.filter(user_id__in=friend_ids, created_at__gte=cutoff)
-            .select_related("user", "movie")
-            .order_by("-created_at")[: limit * 2]
-        )
-        revs = list(
-            Review.objects.filter(user_id__in=friend_ids, created_at__gte=cutoff)
-            .select_related("user", "movie")
-            .order_by("-created_at")[: limit * 2]
+        friend_ids = Friendship.objects.filter(
+            user_id=self.kwargs["user_id"]
+        ).values("friend_id")
+        return (
+            Activity.objects.filter(user_id__in=friend_ids, created_at__gte=cutoff)
+            .select_related("user", "movie", "review")
         )
-
-        activities = []
-        for f in favs:
-            activities.append(
-                {
-                    "type": "favorite",
-                    "created_at": f.created_at,
-                    "data": FavoriteWithUserSerializer(f).data,
-                }
-            )
-        for like_obj in likes:
-            activities.append(
-                {
-                    "type": "like",
-                    "created_at": like_obj.created_at,
-                    "data": LikeWithUserSerializer(like_obj).data,
-                }
-            )
-        for r in revs:
-            activities.append(
-                {
-                    "type": "review",
-                    "created_at": r.created_at,
-                    "data": ReviewActivitySerializer(r).data,
-                }
-            )
-
-        # Sort by created_at desc and trim
-        activities.sort(key=lambda x: x.get("created_at"), reverse=True)
-        activities = activities[:limit]
-
-        # Convert datetime to isoformat for JSON
-        for item in activities:
-            dt = item.get("created_at")
-            item["created_at"] = dt.isoformat() if dt else None
-
-        return Response({"activities": activities, "count": len(activities)})